@@ -0,0 +1,352 @@
+"""Benchmarks of the Keenetic API client against the local fake router.
+
+    python benchmarks/bench.py poll --hosts 1000 --polls 200
+    python benchmarks/bench.py parse --hosts 100 1000 10000
+    python benchmarks/bench.py js
+    python benchmarks/bench.py rates --hosts 1000 10000 50000
+    python benchmarks/bench.py coordinator --hosts 1000 --polls 100 --listeners 200
+    python benchmarks/bench.py log --hosts 1000 --polls 100
+
+`poll` drives Router.custom_request(), `coordinator` drives the full-data
+coordinator inside a bare Home Assistant instance (needs homeassistant),
+`log` compares a tail of "show log" replaying fixtures/router_log.json with a
+full poll, `parse` and `js` time the response parsers and `rates` the client rate engine
+without any network.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+import argparse
+import asyncio
+import importlib.util
+import json
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+from aiohttp import ClientSession, ClientTimeout, CookieJar, TCPConnector
+
+from fake_router import FakeRouter, start_fake_router
+
+ROOT = Path(__file__).resolve().parent.parent
+COMPONENT = ROOT / "custom_components" / "keenetic_api"
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def load_keenetic():
+    """Import keenetic.py on its own, without Home Assistant."""
+    spec = importlib.util.spec_from_file_location("keenetic", COMPONENT / "keenetic.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def report(title: str, rows: dict[str, Any]) -> None:
+    print(title)
+    for key, value in rows.items():
+        print(f"  {key:<24} {value:.3f}" if isinstance(value, float) else f"  {key:<24} {value}")
+
+
+def latency_rows(latencies: list[float], elapsed: float) -> dict[str, Any]:
+    return {
+        "polls": len(latencies),
+        "polls/sec": len(latencies) / elapsed,
+        "latency mean ms": statistics.fmean(latencies) * 1000,
+        "latency p50 ms": percentile(latencies, 50) * 1000,
+        "latency p95 ms": percentile(latencies, 95) * 1000,
+        "latency p99 ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def new_session(keenetic) -> tuple[ClientSession, Any]:
+    connection_stats = keenetic.ConnectionStats()
+    session = ClientSession(
+        connector=TCPConnector(limit=4),
+        timeout=ClientTimeout(total=30),
+        cookie_jar=CookieJar(unsafe=True),
+        trace_configs=[connection_stats.trace_config()],
+    )
+    return session, connection_stats
+
+
+async def bench_poll(args: argparse.Namespace) -> None:
+    keenetic = load_keenetic()
+    fake = FakeRouter(args.hosts, args.interfaces, latency=args.latency)
+    runner, port = await start_fake_router(fake)
+    session, connection_stats = new_session(keenetic)
+    router = keenetic.Router(session, host="http://127.0.0.1", port=port, connection_stats=connection_stats)
+    try:
+        await router.async_setup_obj()
+        tracemalloc.start()
+        await router.custom_request()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(args.polls):
+            fake.tick()
+            poll_start = time.perf_counter()
+            await router.custom_request()
+            latencies.append(time.perf_counter() - poll_start)
+        elapsed = time.perf_counter() - start
+    finally:
+        await router.async_close()
+        await runner.cleanup()
+    report(f"poll: {args.hosts} hosts, {args.interfaces} interfaces, {args.latency * 1000:.0f} ms latency", {
+        **latency_rows(latencies, elapsed),
+        "first poll peak MB": peak / 2**20,
+        "max rss MB": peak_rss_mb(),
+        "auth": router.auth_stats,
+        "connections": connection_stats.as_dict(),
+        "last poll phases ms": {key: round(value * 1000, 3) for key, value in router.poll_timings.items()},
+    })
+
+
+async def bench_log(args: argparse.Namespace) -> None:
+    """One tail of the router log per round, with a fixture line appended before each."""
+    keenetic = load_keenetic()
+    fixture = json.loads((FIXTURES / "router_log.json").read_text(encoding="utf-8"))
+    fake = FakeRouter(args.hosts, args.interfaces, latency=args.latency)
+    runner, port = await start_fake_router(fake)
+    session, connection_stats = new_session(keenetic)
+    router = keenetic.Router(session, host="http://127.0.0.1", port=port, connection_stats=connection_stats)
+    try:
+        await router.async_setup_obj()
+        _, last_index = keenetic.parse_log_presence(await router.show_log(args.lines), -1)
+        tails, polls, events = [], [], 0
+        for idx in range(args.polls):
+            fake.emit_log(fixture[idx % len(fixture)])
+            start = time.perf_counter()
+            found, last_index = keenetic.parse_log_presence(await router.show_log(args.lines), last_index)
+            tails.append(time.perf_counter() - start)
+            events += len(found)
+            start = time.perf_counter()
+            await router.custom_request()
+            polls.append(time.perf_counter() - start)
+    finally:
+        await router.async_close()
+        await runner.cleanup()
+    report(f"log: {args.hosts} hosts, {args.lines} lines per tail, {args.latency * 1000:.0f} ms latency", {
+        "log lines": len(fake.log),
+        "presence events": events,
+        "tail p50 ms": percentile(tails, 50) * 1000,
+        "tail p95 ms": percentile(tails, 95) * 1000,
+        "full poll p50 ms": percentile(polls, 50) * 1000,
+        "full poll p95 ms": percentile(polls, 95) * 1000,
+    })
+
+
+def bench_parse(args: argparse.Namespace) -> None:
+    """json.loads of the whole batch against iter_rci_batch decoding per section from the same buffered text."""
+    keenetic = load_keenetic()
+    for hosts in args.hosts:
+        fake = FakeRouter(hosts, args.interfaces)
+        router = keenetic.Router(None)
+        router._hw_type = "router"
+        router.request_interface = {name: name for name, data in fake.interfaces.items() if data.get("global")}
+        plan = router.plan_request()
+        text = json.dumps([fake.answer(query) for _, _, query in plan])
+        rows = {"response KiB": len(text) / 1024}
+        arrays = keenetic.rci_array_paths(plan)
+        for name, decode in (
+            ("json.loads", json.loads),
+            ("iter_rci_batch", lambda text: keenetic.iter_rci_batch(text, arrays)),
+        ):
+            router._tables.clear()
+            tracemalloc.start()
+            router.unpack_response(plan, decode(text))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                router.unpack_response(plan, decode(text))
+                times.append(time.perf_counter() - start)
+            rows[f"{name} ms"] = statistics.median(times) * 1000
+            rows[f"{name} peak KiB"] = peak / 1024
+        report(f"parse: {hosts} hosts", rows)
+
+
+def timeit(call: Callable[[], Any], repeat: int = 20) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench_rates(args: argparse.Namespace) -> None:
+    """ClientRates.update against the hotspot table update it follows, with churn of hosts."""
+    keenetic = load_keenetic()
+    for hosts in args.hosts:
+        fake = FakeRouter(hosts, 1)
+        table = keenetic.HotspotTable()
+        rates = keenetic.ClientRates()
+        table.update_hosts(fake.hosts)
+        rates.update(table, 0.0)
+        table_times, rates_times = [], []
+        for poll in range(1, args.repeat + 1):
+            fake.tick()
+            fake.hosts[poll % hosts] = fake._host(hosts + poll)
+            start = time.perf_counter()
+            table.update_hosts(fake.hosts)
+            table_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            rates.update(table, float(poll))
+            rates_times.append(time.perf_counter() - start)
+        report(f"rates: {hosts} hosts", {
+            "table update ms": statistics.median(table_times) * 1000,
+            "rates update ms": statistics.median(rates_times) * 1000,
+            "top 10 ms": timeit(lambda: rates.top(10)) * 1000,
+            "moving clients": len(rates.top(hosts)),
+            "slots": len(rates.slots),
+        })
+
+
+def legacy_data_parser(data: str) -> dict[str, str]:
+    """Router.data_parser before parse_js_assignments."""
+    new_data = {}
+    data = data.replace('\n\t', '').replace('\n', '')
+    data = data.split(';')
+    for row in data:
+        if row != '':
+            row = row.split('=')
+            nu = row[0].rstrip()
+            te = row[1].lstrip()
+            if '{' not in te:
+                te = te.replace('"', '')
+            new_data[nu] = te
+    return new_data
+
+
+def bench_js(args: argparse.Namespace) -> None:
+    keenetic = load_keenetic()
+    text = "\n".join(
+        f'var item{idx} = "value {idx}";\nvar obj{idx} = {{\n\t"a": {idx},\n\t"b": [1, 2]\n}};'
+        for idx in range(args.assignments)
+    )
+    rows = {"response KiB": len(text) / 1024}
+    parsers = (
+        ("legacy split", legacy_data_parser),
+        ("parse_js_assignments", keenetic.parse_js_assignments),
+        ("parse_js_statements", keenetic.parse_js_statements),
+    )
+    for name, parser in parsers:
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            parser(text)
+            times.append(time.perf_counter() - start)
+        rows[f"{name} ms"] = statistics.median(times) * 1000
+    report(f"js: {args.assignments * 2} assignments", rows)
+
+
+async def bench_coordinator(args: argparse.Namespace) -> None:
+    try:
+        from homeassistant.config_entries import ConfigEntry
+        from homeassistant.core import HomeAssistant
+    except ImportError:
+        sys.exit("coordinator benchmark needs homeassistant installed")
+    sys.path.insert(0, str(ROOT))
+    from custom_components.keenetic_api import keenetic
+    from custom_components.keenetic_api.const import DOMAIN
+    from custom_components.keenetic_api.coordinator import KeeneticRouterCoordinator
+
+    fake = FakeRouter(args.hosts, args.interfaces, latency=args.latency)
+    runner, port = await start_fake_router(fake)
+    session, connection_stats = new_session(keenetic)
+    router = keenetic.Router(session, host="http://127.0.0.1", port=port, connection_stats=connection_stats)
+    hass = HomeAssistant(str(ROOT / ".bench"))
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="bench",
+        data={"host": "http://127.0.0.1", "port": port},
+        source="user",
+        options={},
+        unique_id="bench",
+    )
+    try:
+        await router.async_setup_obj()
+        coordinator = KeeneticRouterCoordinator(hass, router, 30, entry)
+        coordinator.profiler.enabled = True
+        for _ in range(args.listeners):
+            coordinator.async_add_listener(lambda: None)
+        await coordinator.async_refresh()
+        coordinator.profiler.reset()
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(args.polls):
+            fake.tick()
+            poll_start = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies.append(time.perf_counter() - poll_start)
+        elapsed = time.perf_counter() - start
+    finally:
+        await router.async_close()
+        await runner.cleanup()
+        await hass.async_stop(force=True)
+    report(f"coordinator: {args.hosts} hosts, {args.listeners} listeners", {
+        **latency_rows(latencies, elapsed),
+        "max rss MB": peak_rss_mb(),
+        "last update success": coordinator.last_update_success,
+        "profile ms": coordinator.profiler.as_dict(),
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("poll", "coordinator", "log"):
+        command = commands.add_parser(name)
+        command.add_argument("--hosts", type=int, default=1000)
+        command.add_argument("--interfaces", type=int, default=2)
+        command.add_argument("--latency", type=float, default=0.0)
+        command.add_argument("--polls", type=int, default=100)
+        if name == "coordinator":
+            command.add_argument("--listeners", type=int, default=100)
+        if name == "log":
+            command.add_argument("--lines", type=int, default=64)
+    command = commands.add_parser("parse")
+    command.add_argument("--hosts", type=int, nargs="+", default=[100, 1000, 10000])
+    command.add_argument("--interfaces", type=int, default=2)
+    command.add_argument("--repeat", type=int, default=20)
+    command = commands.add_parser("js")
+    command.add_argument("--assignments", type=int, default=500)
+    command.add_argument("--repeat", type=int, default=50)
+    command = commands.add_parser("rates")
+    command.add_argument("--hosts", type=int, nargs="+", default=[1000, 10000, 50000])
+    command.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    if args.command == "poll":
+        asyncio.run(bench_poll(args))
+    elif args.command == "coordinator":
+        asyncio.run(bench_coordinator(args))
+    elif args.command == "log":
+        asyncio.run(bench_log(args))
+    elif args.command == "parse":
+        bench_parse(args)
+    elif args.command == "rates":
+        bench_rates(args)
+    else:
+        bench_js(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Local stand-in for the Keenetic HTTP API.
+
+Implements /auth with the NDM challenge, batched and single /rci/ requests,
+/ci/startup-config and the firmware endpoints used by the integration, over
+a synthetic router with N hotspot hosts and M WAN interfaces. Log lines added
+with emit_log (e.g. fixtures/router_log.json) are served by "show log".
+
+    python benchmarks/fake_router.py --hosts 1000 --interfaces 4 --latency 0.02
+"""
+
+from __future__ import annotations
+from hashlib import md5, sha256
+from typing import Any
+import argparse
+import asyncio
+import secrets
+import time
+
+from aiohttp import web
+
+REALM = "Keenetic Fake"
+SESSION_COOKIE = "fake_session"
+
+
+class FakeRouter:
+    def __init__(
+        self,
+        hosts: int = 100,
+        interfaces: int = 2,
+        port_forwardings: int = 10,
+        latency: float = 0.0,
+        username: str = "admin",
+        password: str = "admin",
+    ) -> None:
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.started = time.monotonic()
+        # like the firmware, a 401 opens a session whose cookie the challenge is bound to
+        self.challenges: dict[str, str] = {}
+        self.sessions: set[str] = set()
+        self.requests: dict[str, int] = {}
+        self.log: list[dict[str, Any]] = []
+        self.hosts = [self._host(idx) for idx in range(hosts)]
+        self.interfaces = self._interfaces(interfaces)
+        self.port_forwardings = [
+            {
+                "index": f"{idx:016x}",
+                "interface": "ISP",
+                "protocol": "tcp",
+                "port": 10000 + idx,
+                "to-host": f"192.168.1.{idx % 250 + 2}",
+                "comment": f"rule {idx}" if idx % 2 else "",
+                "disable": idx % 3 == 0,
+            }
+            for idx in range(port_forwardings)
+        ]
+
+    @staticmethod
+    def mac(idx: int) -> str:
+        return "02:" + ":".join(f"{(idx >> shift) & 0xff:02x}" for shift in (32, 24, 16, 8, 0))
+
+    def _host(self, idx: int) -> dict[str, Any]:
+        return {
+            "mac": self.mac(idx),
+            "via": self.mac(idx),
+            "ip": f"10.{idx >> 16 & 0xff}.{idx >> 8 & 0xff}.{idx & 0xff}",
+            "hostname": f"host-{idx}",
+            "name": f"Client {idx}" if idx % 3 else "",
+            "interface": {"id": "Bridge0" if idx % 4 else "Bridge1", "name": "Home", "description": "Home network"},
+            "expires": 25000,
+            "registered": True,
+            "access": "permit",
+            "schedule": "",
+            "active": idx % 5 != 0,
+            "rxbytes": idx * 1000,
+            "txbytes": idx * 500,
+            "uptime": 3600 + idx,
+            "link": "up",
+            "ssid": "Fake",
+            "rssi": -40 - idx % 40,
+        }
+
+    def _interfaces(self, count: int) -> dict[str, Any]:
+        interfaces = {
+            "WifiMaster0": {"id": "WifiMaster0", "type": "WifiMaster", "temperature": 50, "state": "up"},
+            "WifiMaster1": {"id": "WifiMaster1", "type": "WifiMaster", "temperature": 55, "state": "up"},
+            "WifiMaster0/AccessPoint0": {"id": "WifiMaster0/AccessPoint0", "type": "AccessPoint", "state": "up", "usedby": ["Bridge0"]},
+            "Bridge0": {"id": "Bridge0", "type": "Bridge", "state": "up", "security-level": "private"},
+        }
+        for idx in range(count):
+            name = "ISP" if idx == 0 else f"Wireguard{idx - 1}"
+            interfaces[name] = {
+                "id": name,
+                "type": "GigabitEthernet" if idx == 0 else "Wireguard",
+                "description": "Provider" if idx == 0 else f"VPN {idx}",
+                "state": "up",
+                "connected": "yes",
+                "security-level": "public",
+                "global": True,
+                "address": f"203.0.113.{idx + 1}",
+                "uptime": 1000 + idx,
+                "wireguard": {"peer": [{"remote": f"198.51.100.{idx}"}]},
+            }
+        return interfaces
+
+    def tick(self) -> None:
+        """Move the counters of active hosts like a live router does."""
+        for host in self.hosts:
+            if host["active"]:
+                host["rxbytes"] += 1500
+                host["txbytes"] += 700
+                host["uptime"] += 1
+
+    def emit_log(self, line: dict[str, Any]) -> None:
+        """Append a log line, numbered like the router does."""
+        self.log.append({"id": len(self.log) + 1, "timestamp": time.strftime("%b %d %H:%M:%S"), **line})
+
+    def show(self, words: tuple[str, ...], params: dict[str, Any]) -> Any:
+        uptime = int(time.monotonic() - self.started) + 100000
+        answers = {
+            ("show", "system"): lambda: {"cpuload": 10, "memory": "40000/131072", "uptime": uptime},
+            ("show", "identification"): lambda: {"mac": "50:ff:20:00:00:01", "serial": "S0000000001"},
+            ("show", "version"): lambda: {"vendor": "Keenetic", "model": "Fake", "device": "Fake", "hw_id": "KN-0000"},
+            ("show", "system", "mode"): lambda: {"active": "router"},
+            ("show", "interface"): lambda: self.interfaces,
+            ("show", "interface", "stat"): lambda: {
+                "rxbytes": uptime * 1000, "txbytes": uptime * 100, "rxspeed": 1000000, "txspeed": 100000,
+            },
+            ("show", "associations"): lambda: {"station": [{"mac": host["mac"]} for host in self.hosts[:64]]},
+            ("show", "rc", "system"): lambda: {"usb": [{"port": 1}, {"port": 2, "power": {"shutdown": True}}]},
+            ("show", "rc", "ip", "http"): lambda: {"security-level": {"private": True}},
+            ("show", "log"): lambda: {
+                "log": {str(line["id"]): line for line in self.log[-int(params.get("max-lines", 100)):]},
+            },
+            ("show", "media"): lambda: {"Media0": {"usb": {"port": 1}}},
+            ("show", "ip", "hotspot"): lambda: {"host": self.hosts},
+            ("show", "ip", "hotspot", "host"): lambda: self.hosts,
+            ("show", "rc", "interface"): lambda: {
+                "WifiMaster0/AccessPoint0": {"ssid": "Fake", "up": True, "authentication": {"wpa-psk": {"psk": "password"}}},
+            },
+            ("show", "rc", "interface", "ip", "global"): lambda: {
+                name: {"order": idx} for idx, name in enumerate(name for name, data in self.interfaces.items() if data.get("global"))
+            },
+            ("show", "rc", "ip", "static"): lambda: self.port_forwardings,
+            ("show", "rc", "ip", "hotspot"): lambda: {
+                "host": [{"mac": host["mac"], "access": "permit"} for host in self.hosts],
+            },
+            ("ip", "policy"): lambda: {"Policy0": {"description": "VPN"}},
+            ("components", "list"): lambda: {
+                "local": {"version": "4.1.0", "title": "4.1.0"},
+                "firmware": {"version": "4.1.1", "title": "4.1.1"},
+                "sandbox": "stable",
+            },
+            ("webhelp", "release-notes"): lambda: {
+                "webhelp": {"ru": [{"href": "https://example.invalid/release-notes", "title": "Release"}]},
+            },
+        }
+        answer = answers.get(words)
+        return answer() if answer is not None else {}
+
+    async def _delay(self, request: web.Request) -> None:
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _authorized(self, request: web.Request) -> bool:
+        return request.cookies.get(SESSION_COOKIE) in self.sessions
+
+    def _unauthorized(self) -> web.Response:
+        session, challenge = secrets.token_hex(16), secrets.token_hex(16)
+        self.challenges[session] = challenge
+        response = web.Response(status=401, headers={"X-NDM-Realm": REALM, "X-NDM-Challenge": challenge})
+        response.set_cookie(SESSION_COOKIE, session)
+        return response
+
+    async def handle_auth(self, request: web.Request) -> web.Response:
+        await self._delay(request)
+        if request.method == "GET":
+            return web.Response(status=200) if self._authorized(request) else self._unauthorized()
+        data = await request.json()
+        session = request.cookies.get(SESSION_COOKIE)
+        challenge = self.challenges.pop(session, None)
+        digest = md5(f"{self.username}:{REALM}:{self.password}".encode()).hexdigest()
+        if (
+            challenge is not None
+            and data.get("login") == self.username
+            and data.get("password") == sha256((challenge + digest).encode()).hexdigest()
+        ):
+            self.sessions.add(session)
+            return web.Response(status=200)
+        return self._unauthorized()
+
+    async def handle_rci(self, request: web.Request) -> web.Response:
+        await self._delay(request)
+        if not self._authorized(request):
+            return self._unauthorized()
+        words = tuple(word for word in request.match_info["path"].split("/") if word)
+        if not words and request.method == "POST":
+            return web.json_response([self.answer(query) for query in await request.json()])
+        params = dict(request.query)
+        if request.method == "POST" and request.can_read_body:
+            params.update(await request.json() or {})
+        return web.json_response(self.show(words, params))
+
+    def answer(self, query: dict[str, Any]) -> dict[str, Any]:
+        """Answer one element of a batch, nested like the query."""
+        words = []
+        node = query
+        while isinstance(node, dict) and len(node) == 1 and isinstance(next(iter(node.values())), dict):
+            word, node = next(iter(node.items()))
+            words.append(word)
+        result = self.show(tuple(words), node if isinstance(node, dict) else {})
+        for word in reversed(words):
+            result = {word: result}
+        return result
+
+    async def handle_startup_config(self, request: web.Request) -> web.Response:
+        await self._delay(request)
+        if not self._authorized(request):
+            return self._unauthorized()
+        return web.Response(
+            body=b"! fake startup-config\nsystem\n    hostname Fake\n!\n",
+            headers={"Content-Disposition": 'attachment; filename="startup-config.txt"'},
+        )
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/auth", self.handle_auth)
+        app.router.add_route("GET", "/ci/startup-config", self.handle_startup_config)
+        app.router.add_route("*", "/rci/{path:.*}", self.handle_rci)
+        return app
+
+
+async def start_fake_router(router: FakeRouter, host: str = "127.0.0.1", port: int = 0) -> tuple[web.AppRunner, int]:
+    runner = web.AppRunner(router.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--hosts", type=int, default=100)
+    parser.add_argument("--interfaces", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    router = FakeRouter(args.hosts, args.interfaces, latency=args.latency)
+    runner, port = await start_fake_router(router, port=args.port)
+    print(f"Fake Keenetic on http://127.0.0.1:{port} (admin/admin)")
+    try:
+        while True:
+            await asyncio.sleep(1)
+            router.tick()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
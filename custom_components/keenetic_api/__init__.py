@@ -1,10 +1,13 @@
 """The Keenetic API integration."""
 
 from __future__ import annotations
+import asyncio
 import logging
-from aiohttp import CookieJar, ClientTimeout, ClientError
+from aiohttp import ClientSession, CookieJar, ClientTimeout, ClientError, TCPConnector
+from collections.abc import Mapping
 from typing import Any
 from datetime import timedelta
+from functools import partial
 
 from homeassistant.const import (
     CONF_HOST,
@@ -19,17 +22,20 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers import aiohttp_client
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers import device_registry as dr
+from homeassistant.util import ssl as ssl_util
 
 from .services import async_setup_services, async_unload_services
 from .coordinator import (
     KeeneticRouterCoordinator, 
     KeeneticRouterFirmwareCoordinator, 
-    KeeneticRouterRcInterfaceCoordinator
+    KeeneticRouterRcInterfaceCoordinator,
+    KeeneticRouterLogCoordinator,
 )
-from .keenetic import Router
+from .keenetic import ConnectionStats, Router
+from .storage import KeeneticSnapshotStore
+from .fleet import KeeneticFleet, async_get_fleet, async_release_fleet
 from .const import (
     DOMAIN, 
     DEFAULT_SCAN_INTERVAL, 
@@ -37,6 +43,8 @@ from .const import (
     COORD_FULL,
     COORD_FIREWARE,
     COORD_RC_INTERFACE,
+    COORD_LOG,
+    LOG_TAIL_INTERVAL,
     REQUEST_TIMEOUT,
     SCAN_INTERVAL_FIREWARE,
     CROUTER,
@@ -46,6 +54,16 @@ from .const import (
     CONF_CREATE_PORT_FRW,
     CONF_CREATE_IMAGE_QR,
     CONF_SELECT_CREATE_DT,
+    CONF_SELECT_CLIENT_RATE,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_CONNECTION_LIMIT,
+    CONF_DNS_CACHE_TTL,
+    CONF_FLEET_MODE,
+    CONF_LOG_TAIL,
+    CONF_IDENTITY,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_CONNECTION_LIMIT,
+    DEFAULT_DNS_CACHE_TTL,
 )
 
 PLATFORMS: list[Platform] = [
@@ -64,29 +82,75 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
-    client = await get_api(hass, entry.data)
+    fleet = None
+    if entry.options.get(CONF_FLEET_MODE, False):
+        fleet = async_get_fleet(hass)
+        fleet.add_entry(entry.entry_id)
+        entry.async_on_unload(partial(async_release_fleet, hass, entry.entry_id))
 
-    coordinator_full = KeeneticRouterCoordinator(hass, client, entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL), entry)
-    await coordinator_full.async_config_entry_first_refresh()
+    client = await get_api(hass, entry.data, entry.options, fleet, entry.data.get(CONF_IDENTITY))
+    entry.async_on_unload(client.async_close)
+    identity_cached = CONF_IDENTITY in entry.data
+    if not identity_cached:
+        hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_IDENTITY: client.identity})
+
+    snapshot = KeeneticSnapshotStore(hass, entry.entry_id)
+    full_data, rc_interface = await snapshot.async_load(client)
+    entry.async_on_unload(snapshot.async_flush)
+    background_refresh = []
+    first_refresh = []
+
+    coordinator_full = KeeneticRouterCoordinator(hass, client, entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL), entry, fleet, snapshot)
+    if full_data is not None:
+        coordinator_full.async_restore(full_data)
+        background_refresh.append(coordinator_full)
+    else:
+        first_refresh.append(coordinator_full)
 
     coordinator_firmware = KeeneticRouterFirmwareCoordinator(hass, client, SCAN_INTERVAL_FIREWARE, entry)
-    await coordinator_firmware.async_refresh()
+    background_refresh.append(coordinator_firmware)
 
     if client.hw_type == "router":
-        coordinator_rc_interface = KeeneticRouterRcInterfaceCoordinator(hass, client, SCAN_INTERVAL_FIREWARE, entry)
-        await coordinator_rc_interface.async_config_entry_first_refresh()
+        coordinator_rc_interface = KeeneticRouterRcInterfaceCoordinator(hass, client, SCAN_INTERVAL_FIREWARE, entry, snapshot)
+        if rc_interface is not None:
+            coordinator_rc_interface.async_restore(rc_interface)
+            background_refresh.append(coordinator_rc_interface)
+        else:
+            first_refresh.append(coordinator_rc_interface)
     else:
         coordinator_rc_interface = None
 
+    coordinator_log = None
+    if client.hw_type == "router" and entry.options.get(CONF_LOG_TAIL, False):
+        coordinator_log = KeeneticRouterLogCoordinator(hass, client, LOG_TAIL_INTERVAL, entry)
+
+        @callback
+        def async_apply_log() -> None:
+            """Show the log presence right away and let an early poll confirm it."""
+            if coordinator_log.last_update_success and coordinator_full.presence.async_apply_log(coordinator_log.data):
+                entry.async_create_background_task(hass, coordinator_full.async_request_refresh(), f"{coordinator_full.name}-log")
+
+        entry.async_on_unload(coordinator_full.async_register_sections(("show_ip_hotspot",)))
+        entry.async_on_unload(coordinator_log.async_add_listener(async_apply_log))
+        background_refresh.append(coordinator_log)
+
+    await asyncio.gather(*(coordinator.async_config_entry_first_refresh() for coordinator in first_refresh))
+
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         CROUTER: client,
         COORD_FULL: coordinator_full,
         COORD_FIREWARE: coordinator_firmware,
-        COORD_RC_INTERFACE: coordinator_rc_interface
+        COORD_RC_INTERFACE: coordinator_rc_interface,
+        COORD_LOG: coordinator_log,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator_full.sections_registered = True
+    for coordinator in background_refresh:
+        entry.async_create_background_task(hass, coordinator.async_refresh(), f"{coordinator.name}-background")
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    if identity_cached:
+        entry.async_create_background_task(hass, async_revalidate_identity(hass, entry, client), f"{DOMAIN}-{entry.entry_id}-identity")
 
     await async_setup_services(hass)
 
@@ -107,6 +171,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await KeeneticSnapshotStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_reload(entry.entry_id)
 
@@ -115,20 +183,58 @@ async def async_remove_config_entry_device(hass: HomeAssistant, entry: ConfigEnt
     return True
 
 
-async def get_api(hass: HomeAssistant, data: dict[str, Any]) -> Router:
-    kwargs: dict[str, Any] = {
-            "timeout": ClientTimeout(total=REQUEST_TIMEOUT),
-            "cookie_jar": CookieJar(unsafe=True),
-        }
-    session = aiohttp_client.async_create_clientsession(hass, data[CONF_SSL], **kwargs)
+async def async_revalidate_identity(hass: HomeAssistant, entry: ConfigEntry, client: Router) -> None:
+    """Identify the router again after a setup from the cache, reloading if it changed."""
+    try:
+        identity = await client.async_identify()
+    except Exception as err:
+        _LOGGER.debug(f"{client.mac} revalidate identity failed - {err}")
+        return
+    if identity != entry.data[CONF_IDENTITY]:
+        _LOGGER.debug(f"{client.mac} identity changed - {identity}")
+        hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_IDENTITY: identity})
+
+
+async def get_api(
+        hass: HomeAssistant,
+        data: dict[str, Any],
+        options: Mapping[str, Any] = {},
+        fleet: KeeneticFleet | None = None,
+        identity: Mapping[str, Any] | None = None,
+) -> Router:
+    connection_stats = ConnectionStats()
+    if fleet is not None:
+        connector = fleet.connector(data[CONF_SSL])
+    else:
+        connector = TCPConnector(
+            limit=options.get(CONF_CONNECTION_LIMIT, DEFAULT_CONNECTION_LIMIT),
+            keepalive_timeout=options.get(CONF_KEEPALIVE_TIMEOUT, DEFAULT_KEEPALIVE_TIMEOUT),
+            use_dns_cache=True,
+            ttl_dns_cache=options.get(CONF_DNS_CACHE_TTL, DEFAULT_DNS_CACHE_TTL),
+            ssl=ssl_util.get_default_context() if data[CONF_SSL] else ssl_util.get_default_no_verify_context(),
+        )
+    session = ClientSession(
+        connector=connector,
+        connector_owner=fleet is None,
+        timeout=ClientTimeout(total=REQUEST_TIMEOUT),
+        cookie_jar=CookieJar(unsafe=True),
+        trace_configs=[connection_stats.trace_config()],
+    )
     client = Router(
         session = session,
         username=data[CONF_USERNAME],
         password=data[CONF_PASSWORD],
         host=data[CONF_HOST],
         port=data[CONF_PORT],
+        connection_stats=connection_stats,
+        request_limiter=fleet.semaphore if fleet is not None else None,
+        max_in_flight=options.get(CONF_CONNECTION_LIMIT, DEFAULT_CONNECTION_LIMIT),
     )
-    await client.async_setup_obj()
+    try:
+        await client.async_setup_obj(identity)
+    except Exception:
+        await client.async_close()
+        raise
     return client
 
 
@@ -163,6 +269,12 @@ def remove_entities_or_devices(hass, entry) -> None:
             and hass.states.get(entity.entity_id).attributes.get("mac") not in entry.options.get(CONF_CLIENTS_SELECT_POLICY, []) 
         ):
             delete_ent = True
+        elif (
+            entity.domain == "sensor"
+            and entity.translation_key in ("client_rxrate", "client_txrate")
+            and entity.unique_id.rsplit("_", 1)[-1] not in entry.options.get(CONF_SELECT_CLIENT_RATE, [])
+        ):
+            delete_ent = True
         if delete_ent:
             _LOGGER.debug(f"Removing entity: {entity}")
             entity_registry.async_remove(entity.entity_id)
@@ -15,13 +15,13 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
     COORD_FULL,
 )
 from .coordinator import KeeneticRouterCoordinator
+from .entity import KeeneticEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +31,8 @@ class KeeneticBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Describes Keenetic sensor entity."""
     value_fn: Callable[[KeeneticRouterCoordinator], bool]
     attributes_fn: Callable[[KeeneticRouterCoordinator], bool] | None = None
+    sections: tuple[str, ...] = ()
+    record: bool = True
 
 
 BINARY_SENSOR_TYPES: dict[str, KeeneticBinarySensorEntityDescription] = {
@@ -44,6 +46,7 @@ BINARY_SENSOR_TYPES: dict[str, KeeneticBinarySensorEntityDescription] = {
         key="connected_to_interface",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         value_fn= lambda coordinator, obj_id: coordinator.data.show_interface[obj_id].get('connected', "no") == "yes",
+        sections=("show_interface",),
     ),
     "connected_to_media": KeeneticBinarySensorEntityDescription(
         key="connected_to_media",
@@ -52,6 +55,7 @@ BINARY_SENSOR_TYPES: dict[str, KeeneticBinarySensorEntityDescription] = {
         attributes_fn=lambda coordinator, obj_id: {
             "media": coordinator.data.show_media.get(obj_id, None),
         },
+        sections=("show_media",),
     ),
 }
 
@@ -86,7 +90,7 @@ async def async_setup_entry(
     async_add_entities(binary_sensors, False)
 
 
-class KeeneticBinarySensorEntity(CoordinatorEntity[KeeneticRouterCoordinator], BinarySensorEntity):
+class KeeneticBinarySensorEntity(KeeneticEntity, BinarySensorEntity):
 
     _attr_has_entity_name = True
     entity_description: KeeneticRouterSensorEntityDescription
@@ -102,6 +106,8 @@ class KeeneticBinarySensorEntity(CoordinatorEntity[KeeneticRouterCoordinator], B
         self._obj_id = obj_id
         self._attr_key = description.key
         self.entity_description = description
+        self._rci_sections = description.sections
+        self._rci_record = obj_id if description.record else None
         self._attr_device_info = coordinator.device_info
         self._attr_unique_id = f"{coordinator.unique_id}_{self._attr_key}_{self._obj_id}"
         self._attr_translation_key = self._attr_key
@@ -38,6 +38,19 @@ from .const import (
     DEFAULT_BACKUP_TYPE_FILE,
     CONF_BACKUP_TYPE_FILE,
     CONF_SELECT_CREATE_DT,
+    CONF_SELECT_CLIENT_RATE,
+    CONF_TOP_TALKERS,
+    CONF_ADAPTIVE_SCAN_INTERVAL,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_CONNECTION_LIMIT,
+    CONF_DNS_CACHE_TTL,
+    CONF_FLEET_MODE,
+    CONF_LOG_TAIL,
+    CONF_IDENTITY,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_TOP_TALKERS,
+    DEFAULT_CONNECTION_LIMIT,
+    DEFAULT_DNS_CACHE_TTL,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -63,7 +76,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             try:
                 router = await get_api(self.hass, user_input)
-                keen = await router.show_version()
+                await router.async_close()
+                keen = router.identity
 
                 title = f"{keen['vendor']} {keen['model']} {user_input['host']}"
 
@@ -74,7 +88,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 unique_id: str = f"{keen['vendor']} {keen['device']} {format_mac(router.mac)[-8:].replace(':', '')}"
                 await self.async_set_unique_id(unique_id)
                 self._abort_if_unique_id_configured()
-                return self.async_create_entry(title=title, data=user_input)
+                return self.async_create_entry(title=title, data={**user_input, CONF_IDENTITY: keen})
 
         return self.async_show_form(step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors)
 
@@ -105,6 +119,41 @@ class OptionsFlow(config_entries.OptionsFlow):
         return await self.async_step_configure_router()
 
 
+    def _common_schema(self) -> dict[vol.Optional, Any]:
+        """Polling and connection options shared by routers and other devices."""
+        return {
+            vol.Optional(
+                CONF_ADAPTIVE_SCAN_INTERVAL,
+                default=self._options.get(
+                    CONF_ADAPTIVE_SCAN_INTERVAL, False
+                ),
+            ): bool,
+            vol.Optional(
+                CONF_KEEPALIVE_TIMEOUT,
+                default=self._options.get(
+                    CONF_KEEPALIVE_TIMEOUT, DEFAULT_KEEPALIVE_TIMEOUT
+                ),
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_CONNECTION_LIMIT,
+                default=self._options.get(
+                    CONF_CONNECTION_LIMIT, DEFAULT_CONNECTION_LIMIT
+                ),
+            ): vol.All(cv.positive_int, vol.Clamp(min=1)),
+            vol.Optional(
+                CONF_DNS_CACHE_TTL,
+                default=self._options.get(
+                    CONF_DNS_CACHE_TTL, DEFAULT_DNS_CACHE_TTL
+                ),
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_FLEET_MODE,
+                default=self._options.get(
+                    CONF_FLEET_MODE, False
+                ),
+            ): bool,
+        }
+
     async def async_step_configure_router(
         self, 
         user_input: dict[str, Any] | None = None
@@ -119,18 +168,21 @@ class OptionsFlow(config_entries.OptionsFlow):
             client['mac']: f"{client['name'] or client['hostname']} ({client['mac']})"
             for client in data_clients
         }
-        clients_policy = clients
-        clients_policy |= {
+        clients_policy = clients | {
             mac: f"Unknown ({mac})"
             for mac in self._options.get(CONF_CLIENTS_SELECT_POLICY, [])
             if mac not in clients
         }
-        clients_dt = clients
-        clients_dt |= {
+        clients_dt = clients | {
             mac: f"Unknown ({mac})"
             for mac in self._options.get(CONF_SELECT_CREATE_DT, [])
             if mac not in clients
         }
+        clients_rate = clients | {
+            mac: f"Unknown ({mac})"
+            for mac in self._options.get(CONF_SELECT_CLIENT_RATE, [])
+            if mac not in clients
+        }
 
         return self.async_show_form(
             step_id="configure_router",
@@ -172,6 +224,18 @@ class OptionsFlow(config_entries.OptionsFlow):
                     ): cv.multi_select(
                         dict(sorted(clients_dt.items(), key=operator.itemgetter(1)))
                     ),
+                    vol.Optional(
+                        CONF_SELECT_CLIENT_RATE,
+                        default=self._options.get(CONF_SELECT_CLIENT_RATE, []),
+                    ): cv.multi_select(
+                        dict(sorted(clients_rate.items(), key=operator.itemgetter(1)))
+                    ),
+                    vol.Optional(
+                        CONF_TOP_TALKERS,
+                        default=self._options.get(
+                            CONF_TOP_TALKERS, DEFAULT_TOP_TALKERS
+                        ),
+                    ): vol.All(cv.positive_int, vol.Clamp(min=1, max=100)),
                     vol.Optional(
                         CONF_CREATE_PORT_FRW,
                         default=self._options.get(
@@ -185,6 +249,13 @@ class OptionsFlow(config_entries.OptionsFlow):
                         "config",
                         "firmware",
                     ]),
+                    vol.Optional(
+                        CONF_LOG_TAIL,
+                        default=self._options.get(
+                            CONF_LOG_TAIL, False
+                        ),
+                    ): bool,
+                    **self._common_schema(),
                 }
             ),
             last_step=False,
@@ -207,7 +278,8 @@ class OptionsFlow(config_entries.OptionsFlow):
                         default=self._options.get(
                             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                         ),
-                    ): vol.All(cv.positive_int, vol.Clamp(min=MIN_SCAN_INTERVAL))
+                    ): vol.All(cv.positive_int, vol.Clamp(min=MIN_SCAN_INTERVAL)),
+                    **self._common_schema(),
                 }
             ),
             last_step=False,
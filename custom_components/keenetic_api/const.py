@@ -8,10 +8,29 @@ MIN_SCAN_INTERVAL: Final = 1
 DEFAULT_SCAN_INTERVAL: Final = 30
 REQUEST_TIMEOUT: Final = 30
 SCAN_INTERVAL_FIREWARE: Final = 1800
+FIREWARE_RETRY_MIN: Final = 60
+SCAN_INTERVAL_RC: Final = 300
+ADAPTIVE_MAX_FACTOR: Final = 8
+ADAPTIVE_STEP: Final = 1.5
+ADAPTIVE_CPU_LOAD_HIGH: Final = 60
+ADAPTIVE_CPU_LOAD_IDLE: Final = 25
+ADAPTIVE_LATENCY_HIGH: Final = 2.0
+ADAPTIVE_LATENCY_IDLE: Final = 0.5
+PROFILE_WINDOW: Final = 100
+TIMING_POLL: Final = "poll"
+LOG_TAIL_INTERVAL: Final = 5
+LOG_TAIL_LINES: Final = 64
+STORAGE_VERSION: Final = 1
+SNAPSHOT_SAVE_DELAY: Final = 300
+RELEASE_NOTES_MAX_AGE: Final = 7 * 24 * 3600
+RELEASE_NOTES_SAVE_DELAY: Final = 10
+FLEET_CONNECTION_LIMIT: Final = 32
+FLEET_MAX_IN_FLIGHT: Final = 16
 
 COORD_FULL: Final = "coordinator_full"
 COORD_FIREWARE: Final = "coordinator_firmware"
 COORD_RC_INTERFACE: Final = "coordinator_rc_interface"
+COORD_LOG: Final = "coordinator_log"
 
 CONF_CLIENTS_SELECT_POLICY: Final = "cliens_select_policy"
 CONF_CREATE_ALL_CLIENTS_POLICY: Final = "create_entity_all_cliens_button_policy"
@@ -19,8 +38,20 @@ CONF_CREATE_IMAGE_QR: Final = "create_image_qr"
 CONF_CREATE_PORT_FRW: Final = "create_entity_port_forwarding"
 CONF_BACKUP_TYPE_FILE: Final = "backup_type_file"
 
+CONF_KEEPALIVE_TIMEOUT: Final = "keepalive_timeout"
+CONF_CONNECTION_LIMIT: Final = "connection_limit"
+CONF_DNS_CACHE_TTL: Final = "dns_cache_ttl"
+
+CONF_ADAPTIVE_SCAN_INTERVAL: Final = "adaptive_scan_interval"
+CONF_FLEET_MODE: Final = "fleet_mode"
+CONF_LOG_TAIL: Final = "log_tail"
+
+CONF_IDENTITY: Final = "identity"
+
 CONF_CREATE_DT: Final = "create_device_tracker"
 CONF_SELECT_CREATE_DT: Final = "create_select_device_tracker"
+CONF_SELECT_CLIENT_RATE: Final = "create_select_client_rate"
+CONF_TOP_TALKERS: Final = "top_talkers"
 
 FW_SANDBOX: Final = {
     "stable": "main",
@@ -33,7 +64,15 @@ POLICY_NOT_INTERNET: Final = "not_internet"
 
 CROUTER: Final = "client_router"
 
+EVENT_CLIENT_JOIN: Final = f"{DOMAIN}_client_join"
+EVENT_CLIENT_LEAVE: Final = f"{DOMAIN}_client_leave"
+EVENT_CLIENT_ROAM: Final = f"{DOMAIN}_client_roam"
+
 DEFAULT_BACKUP_TYPE_FILE: Final = ["config"]
+DEFAULT_KEEPALIVE_TIMEOUT: Final = 75
+DEFAULT_CONNECTION_LIMIT: Final = 4
+DEFAULT_DNS_CACHE_TTL: Final = 300
+DEFAULT_TOP_TALKERS: Final = 5
 
 COUNT_REPEATED_REQUEST_FIREWARE: Final = 30
 TIMER_REPEATED_REQUEST_FIREWARE: Final = 0.3
\ No newline at end of file
@@ -1,24 +1,43 @@
 """The Keenetic API coordinator."""
 
 from __future__ import annotations
-from datetime import timedelta
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any
 import logging
 import asyncio
+import time
 
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator, 
     UpdateFailed,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
 from homeassistant.const import CONF_HOST
+from homeassistant.util import dt as dt_util
 
-from .keenetic import Router
+from .fleet import KeeneticFleet
+from .presence import PresenceEngine
+from .storage import KeeneticSnapshotStore, async_get_release_notes_cache
+from .keenetic import ClientRates, HotspotTable, KeeneticFullData, LatencyHistogram, LogPresence, Router, RCI_SECTIONS, RC_SECTIONS, parse_log_presence
 from .const import (
     DOMAIN, 
     FW_SANDBOX,
-    COORD_FIREWARE,
-    SCAN_INTERVAL_FIREWARE,
+    FIREWARE_RETRY_MIN,
+    SCAN_INTERVAL_RC,
+    CONF_ADAPTIVE_SCAN_INTERVAL,
+    ADAPTIVE_MAX_FACTOR,
+    ADAPTIVE_STEP,
+    ADAPTIVE_CPU_LOAD_HIGH,
+    ADAPTIVE_CPU_LOAD_IDLE,
+    ADAPTIVE_LATENCY_HIGH,
+    ADAPTIVE_LATENCY_IDLE,
+    PROFILE_WINDOW,
+    LOG_TAIL_LINES,
+    TIMING_POLL,
     COUNT_REPEATED_REQUEST_FIREWARE,
     TIMER_REPEATED_REQUEST_FIREWARE,
 )
@@ -26,18 +45,80 @@ from .const import (
 _LOGGER = logging.getLogger(__name__)
 
 
-class KeeneticRouterCoordinator(DataUpdateCoordinator):
+class PollProfiler:
+    """Rolling window of the phases of full coordinator polls."""
+
+    PHASES = ("auth", "network", "decode", "build", "dispatch", "total")
+
+    def __init__(self, size: int = PROFILE_WINDOW) -> None:
+        self.enabled = False
+        self._size = size
+        self.reset()
+
+    def reset(self) -> None:
+        self._phases = {phase: LatencyHistogram(self._size) for phase in self.PHASES}
+        self.last: dict[str, float] = {}
+
+    def add(self, phases: dict[str, float]) -> None:
+        for phase in self.PHASES:
+            self._phases[phase].add(phases.get(phase, 0.0))
+        self.last = phases
+
+    def as_dict(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "last": self.last,
+            "phases": {phase: histogram.as_dict() for phase, histogram in self._phases.items()},
+        }
+
+
+class SnapshotRestoreMixin:
+    """Coordinator data restored from the snapshot at startup and saved after each live poll."""
+
+    router: Router
+    _snapshot: KeeneticSnapshotStore | None = None
+    restored = False
+
+    @callback
+    def async_restore(self, data: Any) -> None:
+        """Start from the stored snapshot, stale until the first live poll."""
+        self.data = data
+        self.restored = True
+
+    def _save_snapshot(self, **data: Any) -> None:
+        self.restored = False
+        if self._snapshot is not None:
+            self._snapshot.async_schedule_save(self.router.mac, **data)
+
+
+class KeeneticRouterCoordinator(SnapshotRestoreMixin, DataUpdateCoordinator):
     def __init__(
             self,
             hass: HomeAssistant,
             router: Router,
             update_interval: int,
-            entry: ConfigEntry
+            entry: ConfigEntry,
+            fleet: KeeneticFleet | None = None,
+            snapshot: KeeneticSnapshotStore | None = None,
     ) -> None:
         self.router = router
         self.entry = entry
         self._host = entry.data[CONF_HOST]
         self.unique_id = f"{entry.unique_id}_full"
+        self._fleet = fleet
+        self._snapshot = snapshot
+        self.presence = PresenceEngine(hass, router.mac)
+        self.rates = ClientRates()
+        self._hotspot_polled = False
+        self.sections_registered = False
+        self._registered_sections: dict[object, frozenset[str]] = {}
+        self._rc_updated: float | None = None
+        self.previous_data: KeeneticFullData | None = None
+        self.skipped_writes = 0
+        self._scan_interval = update_interval
+        self._adaptive = entry.options.get(CONF_ADAPTIVE_SCAN_INTERVAL, False)
+        self.profiler = PollProfiler()
+        self._poll_phases: dict[str, float] | None = None
         super().__init__(
             hass,
             _LOGGER,
@@ -45,24 +126,135 @@ class KeeneticRouterCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=update_interval),
         )
 
+    @callback
+    def async_restore(self, data: KeeneticFullData) -> None:
+        super().async_restore(data)
+        self.presence.async_set_baseline(data.show_ip_hotspot)
+
+    @callback
+    def async_register_sections(self, sections: Iterable[str]) -> CALLBACK_TYPE:
+        """Register the RCI sections an entity reads."""
+        token = object()
+        self._registered_sections[token] = frozenset(sections)
+
+        @callback
+        def async_unregister_sections() -> None:
+            self._registered_sections.pop(token, None)
+
+        return async_unregister_sections
+
+    @property
+    def requested_sections(self) -> set[str] | None:
+        """Sections of the next poll, everything until the platforms have registered theirs."""
+        if not self.sections_registered:
+            return None
+        return set().union(*self._registered_sections.values())
+
+    @callback
+    def async_expire_config(self) -> None:
+        """Fetch the running-config sections on the next poll."""
+        self._rc_updated = None
+
+    async def async_request_config_refresh(self) -> None:
+        """Refresh after a write through the integration."""
+        self.async_expire_config()
+        await self.async_request_refresh()
+
+    async def _async_fetch_data(self):
+        """Poll telemetry, running-config only every SCAN_INTERVAL_RC."""
+        now = time.monotonic()
+        sections = self.requested_sections
+        rc_due = self.data is None or self._rc_updated is None or now - self._rc_updated >= SCAN_INTERVAL_RC
+        if not rc_due:
+            if sections is None:
+                sections = set(RCI_SECTIONS) | {"stat_interface"}
+            sections = sections - RC_SECTIONS
+        full_data = await self.router.custom_request(sections, TIMING_POLL)
+        self._hotspot_polled = sections is None or "show_ip_hotspot" in sections
+        if self._hotspot_polled:
+            self.rates.update(full_data.show_ip_hotspot, time.monotonic())
+        if rc_due:
+            self._rc_updated = now
+        else:
+            for name in RC_SECTIONS:
+                setattr(full_data, name, getattr(self.data, name))
+        return full_data
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """In fleet mode, put the next scheduled poll on the entry's phase instead of an interval after the last one."""
+        super()._schedule_refresh()
+        if self._fleet is None or self._unsub_refresh is None:
+            return
+        self._async_unsub_refresh()
+        delay = self._fleet.poll_delay(self.entry.entry_id, self.update_interval.total_seconds())
+        loop = self.hass.loop
+        self._unsub_refresh = loop.call_at(loop.time() + delay, self.hass.async_run_hass_job, self._job).cancel
+
     async def _async_update_data(self):
         """Asynchronous update of all data."""
         _errr = None
         try:
-            full_data = await self.router.custom_request()
+            start = time.monotonic()
+            full_data = await self._async_fetch_data()
+            latency = time.monotonic() - start
+            if self._adaptive:
+                self._adapt_interval(full_data.show_system.get("cpuload"), latency)
+            if self.profiler.enabled:
+                self._poll_phases = {**self.router.poll_timings, "total": latency}
         except Exception as err:
             _LOGGER.debug(f"{self.router.mac} UpdateFailed _async_update_data (err {err})")
             _errr = err
-        try:
-            coordinator_firmware = self.hass.data[DOMAIN][self.entry.entry_id][COORD_FIREWARE]
-            if (not coordinator_firmware.last_update_success) or _errr != None:
-                await coordinator_firmware.async_refresh()
-        except Exception:
-                pass
         if _errr != None:
             raise UpdateFailed(f"{self.router.mac} UpdateFailed (err {_errr})")
+        self.previous_data = self.data
+        self._save_snapshot(full_data=full_data)
         return full_data
 
+    def _adapt_interval(self, cpuload: int | None, latency: float) -> None:
+        """Back off while the router is loaded or slow, return toward the scan interval when idle."""
+        interval = self.update_interval.total_seconds()
+        cpuload = cpuload or 0
+        if cpuload >= ADAPTIVE_CPU_LOAD_HIGH or latency >= ADAPTIVE_LATENCY_HIGH:
+            interval = min(self._scan_interval * ADAPTIVE_MAX_FACTOR, interval * ADAPTIVE_STEP)
+        elif cpuload <= ADAPTIVE_CPU_LOAD_IDLE and latency <= ADAPTIVE_LATENCY_IDLE:
+            interval = max(self._scan_interval, interval / ADAPTIVE_STEP)
+        if interval != self.update_interval.total_seconds():
+            _LOGGER.debug(f"{self.router.mac} update_interval {interval:.1f}s (cpuload {cpuload}, latency {latency:.2f}s)")
+            self.update_interval = timedelta(seconds=interval)
+
+    def records_changed(self, sections: Iterable[str], record: str | None = None) -> bool:
+        """Whether the last poll changed the sections, or only their given record."""
+        if self.previous_data is None:
+            return True
+        for section in sections:
+            old_data = getattr(self.previous_data, section)
+            new_data = getattr(self.data, section)
+            if old_data is new_data and isinstance(new_data, HotspotTable):
+                if new_data.changed if record is None else record in new_data.changed:
+                    return True
+            elif record is None:
+                if old_data != new_data:
+                    return True
+            elif old_data.get(record) != new_data.get(record):
+                return True
+        return False
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Dispatch the poll to the presence engine and entities, reporting the state writes saved by records_changed."""
+        self.skipped_writes = 0
+        start = time.monotonic()
+        if self.last_update_success and self._hotspot_polled:
+            self._hotspot_polled = False
+            self.presence.async_update(self.data.show_ip_hotspot)
+        super().async_update_listeners()
+        if self._poll_phases is not None:
+            self._poll_phases["dispatch"] = time.monotonic() - start
+            self.profiler.add(self._poll_phases)
+            self._poll_phases = None
+        _LOGGER.debug(f"{self.router.mac} state writes skipped {self.skipped_writes}")
+
     @property
     def device_info(self) -> DeviceInfo:
         """Set device info."""
@@ -90,6 +282,9 @@ class KeeneticRouterFirmwareCoordinator(DataUpdateCoordinator):
         self.unique_id = f"{entry.unique_id}_fw"
         self._host = entry.data[CONF_HOST]
         self._version_firmware = {}
+        self._scan_interval = update_interval
+        self.failures = 0
+        self.last_success: datetime | None = None
         super().__init__(
             hass,
             _LOGGER,
@@ -98,6 +293,31 @@ class KeeneticRouterFirmwareCoordinator(DataUpdateCoordinator):
         )
 
     async def _async_update_data(self):
+        """Firmware check with its own health, retried with backoff after a failure."""
+        try:
+            version_firmware = await self._async_check_firmware()
+        except Exception as err:
+            self.failures += 1
+            retry = min(self._scan_interval, FIREWARE_RETRY_MIN * 2 ** (self.failures - 1))
+            self.update_interval = timedelta(seconds=retry)
+            _LOGGER.debug(f"{self.router.mac} firmware check failed {self.failures} times, retry in {retry}s (err {err})")
+            raise UpdateFailed(f"{self.router.mac} UpdateFailed {err}")
+        if self.failures:
+            self.failures = 0
+            self.update_interval = timedelta(seconds=self._scan_interval)
+        self.last_success = dt_util.utcnow()
+        return version_firmware
+
+    @property
+    def health(self) -> dict[str, Any]:
+        return {
+            "last_update_success": self.last_update_success,
+            "failures": self.failures,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "next_check": self.update_interval.total_seconds(),
+        }
+
+    async def _async_check_firmware(self) -> dict[str, Any]:
         repeat=0
         while repeat < COUNT_REPEATED_REQUEST_FIREWARE:
             repeat += 1
@@ -115,19 +335,40 @@ class KeeneticRouterFirmwareCoordinator(DataUpdateCoordinator):
             or self._version_firmware.get("new").get("version") != firmware.get("new").get("version") 
             or self._version_firmware.get("current").get("version") != firmware.get("current").get("version")
         ):
-            repeat=0
-            while repeat < COUNT_REPEATED_REQUEST_FIREWARE:
-                repeat += 1
-                data_release_notes = await self.router.release_notes(firmware['new']['version'], FW_SANDBOX[firmware['sandbox']])
-                if not data_release_notes.get('continued', False):
-                    break
-                _LOGGER.debug(f"{self.router.mac} data_release_notes not data {data_release_notes}")
-                await asyncio.sleep(TIMER_REPEATED_REQUEST_FIREWARE)
-            firmware['release_notes'] = data_release_notes['webhelp']['ru'][0]['href']
-            firmware['channel'] = data_release_notes['webhelp']['ru'][0]['title']
+            version = firmware['new']['version']
+            channel = FW_SANDBOX[firmware['sandbox']]
+            release_notes = await async_get_release_notes_cache(self.hass).async_get(
+                version, channel, partial(self._async_fetch_release_notes, version, channel)
+            )
+            firmware['release_notes'] = release_notes['release_notes']
+            firmware['channel'] = release_notes['channel']
             self._version_firmware = firmware
+            self._async_update_sw_version()
         return self._version_firmware
 
+    async def _async_fetch_release_notes(self, version: str, channel: str) -> dict[str, Any]:
+        repeat=0
+        while repeat < COUNT_REPEATED_REQUEST_FIREWARE:
+            repeat += 1
+            data_release_notes = await self.router.release_notes(version, channel)
+            if not data_release_notes.get('continued', False):
+                break
+            _LOGGER.debug(f"{self.router.mac} data_release_notes not data {data_release_notes}")
+            await asyncio.sleep(TIMER_REPEATED_REQUEST_FIREWARE)
+        return {
+            'release_notes': data_release_notes['webhelp']['ru'][0]['href'],
+            'channel': data_release_notes['webhelp']['ru'][0]['title'],
+        }
+
+    @callback
+    def _async_update_sw_version(self) -> None:
+        """The firmware check runs after platform setup, so refresh the registered device."""
+        device_registry = dr.async_get(self.hass)
+        device = device_registry.async_get_device(connections={(CONNECTION_NETWORK_MAC, self.router.mac)})
+        sw_version = self.device_info.get("sw_version")
+        if device is not None and device.sw_version != sw_version:
+            device_registry.async_update_device(device.id, sw_version=sw_version)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Set device info."""
@@ -142,18 +383,20 @@ class KeeneticRouterFirmwareCoordinator(DataUpdateCoordinator):
         )
 
 
-class KeeneticRouterRcInterfaceCoordinator(DataUpdateCoordinator):
+class KeeneticRouterRcInterfaceCoordinator(SnapshotRestoreMixin, DataUpdateCoordinator):
     def __init__(
             self,
             hass: HomeAssistant,
             router: Router,
             update_interval: int,
-            entry: ConfigEntry
+            entry: ConfigEntry,
+            snapshot: KeeneticSnapshotStore | None = None,
     ) -> None:
         self.router = router
         self.entry = entry
         self._host = entry.data[CONF_HOST]
         self.unique_id = f"{entry.unique_id}_rc_interface"
+        self._snapshot = snapshot
         super().__init__(
             hass,
             _LOGGER,
@@ -164,10 +407,12 @@ class KeeneticRouterRcInterfaceCoordinator(DataUpdateCoordinator):
     async def _async_update_data(self):
         """Asynchronous update of all data."""
         try:
-            return await self.router.show_rc_interface()
+            rc_interface = await self.router.show_rc_interface()
         except Exception as err:
             _LOGGER.debug(f"{self.router.mac} UpdateFailed _async_update_data (err {err})")
             raise UpdateFailed(f"{self.router.mac} UpdateFailed {err}")
+        self._save_snapshot(rc_interface=rc_interface)
+        return rc_interface
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -175,3 +420,37 @@ class KeeneticRouterRcInterfaceCoordinator(DataUpdateCoordinator):
         return DeviceInfo(
             connections={(CONNECTION_NETWORK_MAC, self.router.mac)}
         )
+
+
+class KeeneticRouterLogCoordinator(DataUpdateCoordinator):
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            router: Router,
+            update_interval: int,
+            entry: ConfigEntry
+    ) -> None:
+        self.router = router
+        self.entry = entry
+        self._host = entry.data[CONF_HOST]
+        self.unique_id = f"{entry.unique_id}_log"
+        self._last_index: int | None = None
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}-{self._host}-log",
+            update_interval=timedelta(seconds=update_interval),
+        )
+
+    async def _async_update_data(self) -> list[LogPresence]:
+        """Presence updates from the log lines added since the last tail."""
+        try:
+            data_show_log = await self.router.show_log(LOG_TAIL_LINES)
+        except Exception as err:
+            _LOGGER.debug(f"{self.router.mac} UpdateFailed _async_update_data (err {err})")
+            raise UpdateFailed(f"{self.router.mac} UpdateFailed {err}")
+        events, last_index = parse_log_presence(data_show_log, -1 if self._last_index is None else self._last_index)
+        if self._last_index is None:
+            events = []
+        self._last_index = last_index
+        return events
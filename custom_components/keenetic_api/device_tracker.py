@@ -1,6 +1,7 @@
 """The Keenetic API device tracking entities."""
 
 from __future__ import annotations
+from collections.abc import Iterable
 import logging
 
 from homeassistant.components.device_tracker import SourceType
@@ -11,9 +12,9 @@ from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, Device
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .coordinator import KeeneticRouterCoordinator
+from .entity import KeeneticEntity
 from .const import (
     DOMAIN,
     COORD_FULL,
@@ -33,11 +34,12 @@ async def async_setup_entry(
     tracked: dict[str, KeeneticScannerEntity] = {}
 
     @callback
-    def async_update_router() -> None:
+    def async_add_trackers(macs: Iterable[str]) -> None:
         device_trackers: list[KeeneticScannerEntity] = []
-        for mac, device in coordinator.data.show_ip_hotspot.items():
+        for mac in macs:
             if mac in entry.options.get(CONF_SELECT_CREATE_DT, []) or entry.options.get(CONF_CREATE_DT, False):
                 if mac not in tracked:
+                    device = coordinator.data.show_ip_hotspot[mac]
                     tracked[mac] = KeeneticScannerEntity(
                         coordinator, 
                         mac, 
@@ -46,11 +48,14 @@ async def async_setup_entry(
                     device_trackers.append(tracked[mac])
         async_add_entities(device_trackers)
 
-    entry.async_on_unload(coordinator.async_add_listener(async_update_router))
-    async_update_router()
+    if entry.options.get(CONF_CREATE_DT, False) or entry.options.get(CONF_SELECT_CREATE_DT, []):
+        entry.async_on_unload(coordinator.async_register_sections(("show_ip_hotspot",)))
+    entry.async_on_unload(coordinator.presence.async_subscribe_new_clients(async_add_trackers))
+    async_add_trackers(list(coordinator.data.show_ip_hotspot))
 
 
-class KeeneticScannerEntity(CoordinatorEntity[KeeneticRouterCoordinator], ScannerEntity, RestoreEntity):
+class KeeneticScannerEntity(KeeneticEntity, ScannerEntity, RestoreEntity):
+    _rci_sections = ("show_ip_hotspot",)
     _unrecorded_attributes = frozenset({
         "uptime",
         "rssi",
@@ -78,13 +83,17 @@ class KeeneticScannerEntity(CoordinatorEntity[KeeneticRouterCoordinator], Scanne
         """Return the source type, eg gps or router, of the device."""
         return SourceType.ROUTER
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.presence.async_subscribe(self._mac, self.async_write_ha_state))
+
+    def _records_changed(self) -> bool:
+        """Changes of the client arrive through the presence engine subscription."""
+        return False
+
     @property
     def is_connected(self) -> bool:
-        return any(
-            devs.active
-            for mac, devs in self.coordinator.data.show_ip_hotspot.items()
-            if mac == self._mac and devs.active
-        )
+        return self.coordinator.presence.is_connected(self._mac)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -0,0 +1,34 @@
+"""The Keenetic API diagnostics."""
+
+from __future__ import annotations
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    CROUTER,
+    COORD_FIREWARE,
+)
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, "mac", "serial"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    router = hass.data[DOMAIN][entry.entry_id][CROUTER]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "router": {
+            "model": router.model,
+            "hw_type": router.hw_type,
+            "request_interface": router.request_interface,
+        },
+        "auth": router.auth_stats,
+        "connections": router.connection_stats,
+        "breaker": router.breaker,
+        "request_timings": router.request_timings.as_dict(),
+        "firmware": hass.data[DOMAIN][entry.entry_id][COORD_FIREWARE].health,
+    }
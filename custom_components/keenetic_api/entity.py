@@ -0,0 +1,55 @@
+"""The Keenetic API base entity."""
+
+from __future__ import annotations
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import KeeneticRouterCoordinator, SnapshotRestoreMixin
+
+
+class RestoredStateMixin:
+    """Entity of a coordinator that may still hold the snapshot restored at startup."""
+
+    coordinator: SnapshotRestoreMixin
+
+    @property
+    def assumed_state(self) -> bool:
+        """Restored from the snapshot and not confirmed by a live poll yet."""
+        return self.coordinator.restored
+
+
+class KeeneticEntity(RestoredStateMixin, CoordinatorEntity[KeeneticRouterCoordinator]):
+    """Entity of the full coordinator that polls only the RCI sections it reads."""
+
+    _rci_sections: tuple[str, ...] | None = ()
+    _rci_record: str | None = None
+    _last_update_success = True
+    _last_restored = False
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._last_update_success = self.coordinator.last_update_success
+        self._last_restored = self.coordinator.restored
+        if self._rci_sections:
+            self.async_on_remove(self.coordinator.async_register_sections(self._rci_sections))
+
+    def _records_changed(self) -> bool:
+        return self.coordinator.records_changed(self._rci_sections, self._rci_record)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when availability or a record read by the entity changed."""
+        update_success = self.coordinator.last_update_success
+        if (
+            update_success
+            and self._last_update_success
+            and self._last_restored == self.coordinator.restored
+            and self._rci_sections is not None
+            and not self._records_changed()
+        ):
+            self.coordinator.skipped_writes += 1
+            return
+        self._last_update_success = update_success
+        self._last_restored = self.coordinator.restored
+        super()._handle_coordinator_update()
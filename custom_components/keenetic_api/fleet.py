@@ -0,0 +1,84 @@
+"""Connection pool and poll schedule shared by the Keenetic entries in fleet mode."""
+
+from __future__ import annotations
+import asyncio
+import logging
+import time
+
+from aiohttp import TCPConnector
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import ssl as ssl_util
+
+from .const import (
+    DOMAIN,
+    FLEET_CONNECTION_LIMIT,
+    FLEET_MAX_IN_FLIGHT,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_DNS_CACHE_TTL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_FLEET = f"{DOMAIN}_fleet"
+
+
+class KeeneticFleet:
+    """One bounded connector per ssl mode, a global in-flight cap and evenly spread poll phases."""
+
+    def __init__(self) -> None:
+        self.semaphore = asyncio.Semaphore(FLEET_MAX_IN_FLIGHT)
+        self._connectors: dict[bool, TCPConnector] = {}
+        self._slots: dict[str, int] = {}
+        self._epoch = time.monotonic()
+
+    def connector(self, verify_ssl: bool) -> TCPConnector:
+        connector = self._connectors.get(verify_ssl)
+        if connector is None or connector.closed:
+            connector = self._connectors[verify_ssl] = TCPConnector(
+                limit=FLEET_CONNECTION_LIMIT,
+                keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+                use_dns_cache=True,
+                ttl_dns_cache=DEFAULT_DNS_CACHE_TTL,
+                ssl=ssl_util.get_default_context() if verify_ssl else ssl_util.get_default_no_verify_context(),
+            )
+        return connector
+
+    def add_entry(self, entry_id: str) -> None:
+        if entry_id not in self._slots:
+            self._slots[entry_id] = len(self._slots)
+
+    def poll_delay(self, entry_id: str, interval: float) -> float:
+        """Seconds until the phase of the entry's slot, slots spread evenly over the interval."""
+        slot = self._slots.get(entry_id)
+        if slot is None or interval <= 0:
+            return 0.0
+        phase = interval * slot / len(self._slots)
+        return (phase - (time.monotonic() - self._epoch)) % interval
+
+    async def async_remove_entry(self, entry_id: str) -> bool:
+        """Forget the entry, closing the connectors with the last one. True once the fleet is empty."""
+        if self._slots.pop(entry_id, None) is not None:
+            # keep the slots dense so the remaining entries stay evenly spread
+            self._slots = {
+                entry: slot for slot, entry in enumerate(sorted(self._slots, key=self._slots.__getitem__))
+            }
+        if self._slots:
+            return False
+        for connector in self._connectors.values():
+            await connector.close()
+        self._connectors.clear()
+        return True
+
+
+def async_get_fleet(hass: HomeAssistant) -> KeeneticFleet:
+    if DATA_FLEET not in hass.data:
+        hass.data[DATA_FLEET] = KeeneticFleet()
+    return hass.data[DATA_FLEET]
+
+
+async def async_release_fleet(hass: HomeAssistant, entry_id: str) -> None:
+    fleet: KeeneticFleet | None = hass.data.get(DATA_FLEET)
+    if fleet is not None and await fleet.async_remove_entry(entry_id):
+        _LOGGER.debug("fleet released")
+        hass.data.pop(DATA_FLEET)
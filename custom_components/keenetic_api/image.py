@@ -19,6 +19,7 @@ from .const import (
     COORD_RC_INTERFACE,
 )
 from .coordinator import KeeneticRouterRcInterfaceCoordinator
+from .entity import RestoredStateMixin
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,7 +48,7 @@ async def async_setup_entry(
     async_add_entities(images)
 
 
-class KeeneticQrWiFiImageEntity(CoordinatorEntity[KeeneticRouterRcInterfaceCoordinator], ImageEntity):
+class KeeneticQrWiFiImageEntity(RestoredStateMixin, CoordinatorEntity[KeeneticRouterRcInterfaceCoordinator], ImageEntity):
 
     _attr_has_entity_name = True
     _attr_content_type = "image/png"
@@ -100,6 +101,11 @@ class KeeneticQrWiFiImageEntity(CoordinatorEntity[KeeneticRouterRcInterfaceCoord
             self._attr_image_last_updated = dt_util.utcnow()
         super()._handle_coordinator_update()
 
+    @property
+    def available(self) -> bool:
+        """The snapshot keeps no password, so no code until the first live poll."""
+        return super().available and not self.coordinator.restored
+
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra attributes of the image."""
@@ -2,32 +2,67 @@
 
 from __future__ import annotations
 from hashlib import md5, sha256
-from collections.abc import Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from json import JSONDecoder, loads
 from typing import Literal, Any
+from collections import deque
+from itertools import count, repeat
+from array import array
 import asyncio
 import aiohttp
+import contextlib
+import heapq
 import logging
+import random
+import re
+import time
 import aiofiles.os
 from pathlib import Path
-from dataclasses import dataclass
+from sys import intern
+from dataclasses import astuple, dataclass, field, fields
+from yarl import URL
 
 _LOGGER = logging.getLogger(__name__)
 
+PROBE_TIMEOUT = 5
+MAX_IN_FLIGHT = 4
+LATENCY_PERCENTILES = (50, 95, 99)
+
+_RCI_DECODER = JSONDecoder()
+_RCI_SEPARATOR = re.compile(r"[\s,]*")
+_RCI_COLON = re.compile(r"\s*:")
+_JS_STRING = r""""(?:[^"\\]++|\\.)*+"|'(?:[^'\\]++|\\.)*+'"""
+_JS_COMMENT = r"//[^\n]*+|/\*.*?\*/"
+_JS_SPLIT_STRING = re.compile(r';[^"\n;]*"')
+
+
+# comments match with an empty group, so findall() leaves them out as ''
+_JS_TOKEN = re.compile(rf"""((?:{_JS_STRING}|[^"'/{{}}\[\]();=]++)++)|{_JS_COMMENT}|(.)""", re.DOTALL)
+_JS_STRING_VALUE = re.compile(rf"\s*+({_JS_STRING})\s*+")
+_JS_OPEN = frozenset("{[(")
+_JS_CLOSE = frozenset("}])")
+
+_LOG_STA = re.compile(r"STA\((?P<mac>[0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5})\) (?:had )?(?P<action>re-?associated|associated|disassociated|deauthenticated)")
+_LOG_DHCPACK = re.compile(r"DHCPACK\b")
+_LOG_MAC = re.compile(r"\b[0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5}\b")
+_LOG_IP = re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}\b")
+
 @dataclass
 class KeeneticFullData:
-    show_system: dict[str, Any]
-    show_ip_hotspot: DataDevice
-    show_interface: dict[str, Any]
-    show_rc_ip_static: dict[str, Any]
-    show_associations: dict[str, Any]
-    show_ip_hotspot_policy: dict[str, Any]
-    priority_interface: dict[str, Any]
-    show_rc_ip_http: dict[str, Any]
-    show_rc_system_usb: dict[str, Any]
-    show_media: dict[str, Any]
-    stat_interface: dict[str, Any]
+    show_system: dict[str, Any] = field(default_factory=dict)
+    # the router's persistent table, left as is by polls without it; None until first polled
+    show_ip_hotspot: HotspotTable | None = None
+    show_interface: dict[str, Any] = field(default_factory=dict)
+    show_rc_ip_static: dict[str, DataPortForwarding] = field(default_factory=dict)
+    show_associations: dict[str, Any] = field(default_factory=dict)
+    show_ip_hotspot_policy: dict[str, Any] = field(default_factory=dict)
+    priority_interface: dict[str, Any] = field(default_factory=dict)
+    show_rc_ip_http: dict[str, Any] = field(default_factory=dict)
+    show_rc_system_usb: list[dict[str, Any]] = field(default_factory=list)
+    show_media: dict[str, Any] = field(default_factory=dict)
+    stat_interface: dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class DataDevice():
     mac: str
     name: str
@@ -40,6 +75,154 @@ class DataDevice():
     rxbytes: int
     txbytes: int
 
+    def update(self, values: tuple) -> bool:
+        """Update the record in place from values in field order after mac."""
+        current = (self.name, self.hostname, self.ip, self.active, self.interface_id, self.uptime, self.rssi, self.rxbytes, self.txbytes)
+        if current == values:
+            return False
+        (self.name, self.hostname, self.ip, self.active, self.interface_id, self.uptime, self.rssi, self.rxbytes, self.txbytes) = values
+        return True
+
+
+class HotspotTable(dict[str, DataDevice]):
+    """Hotspot hosts by mac, updated in place from poll to poll."""
+
+    __slots__ = ("changed",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.changed: set[str] = set()
+
+    def update_hosts(self, data_show_ip_hotspot: list[dict[str, Any]]) -> HotspotTable:
+        """Apply a 'show ip hotspot' host list, remembering the macs that changed."""
+        changed = set()
+        seen = set()
+        for hotspot in data_show_ip_hotspot:
+            mac = intern(hotspot["mac"])
+            interface_id = hotspot.get('interface', {"id": None}).get('id')
+            values = (
+                hotspot.get('name'), 
+                hotspot.get('hostname'), 
+                hotspot.get('ip'), 
+                hotspot.get('active'), 
+                intern(interface_id) if interface_id is not None else None,
+                hotspot.get('uptime'), 
+                hotspot.get('rssi'), 
+                hotspot.get('rxbytes'), 
+                hotspot.get('txbytes'), 
+            )
+            seen.add(mac)
+            device = self.get(mac)
+            if device is None:
+                self[mac] = DataDevice(mac, *values)
+                changed.add(mac)
+            elif device.update(values):
+                changed.add(mac)
+        for mac in self.keys() - seen:
+            del self[mac]
+            changed.add(mac)
+        self.changed = changed
+        return self
+
+
+class ClientRates:
+    """Receive and transmit rates of hotspot clients in bytes per second, kept in packed arrays by slot."""
+
+    def __init__(self) -> None:
+        self.slots: dict[str, int] = {}
+        self._macs: list[str | None] = []
+        self._free: list[int] = []
+        self._rxbytes = array("Q")
+        self._txbytes = array("Q")
+        self.rx = array("d")
+        self.tx = array("d")
+        self._moving: set[int] = set()
+        self._updated: float | None = None
+        self.changed: set[str] = set()
+
+    def rate(self, mac: str) -> tuple[float, float] | None:
+        slot = self.slots.get(mac)
+        return (self.rx[slot], self.tx[slot]) if slot is not None else None
+
+    def update(self, table: HotspotTable, now: float) -> None:
+        """One pass over the macs changed by the poll, the counters of the others did not move."""
+        elapsed = now - self._updated if self._updated is not None else 0.0
+        macs = table.changed if self._updated is not None else table.keys()
+        self._updated = now
+        slots, rx_rates, tx_rates = self.slots, self.rx, self.tx
+        rx_counters, tx_counters = self._rxbytes, self._txbytes
+        moving = set()
+        changed = set()
+        for mac in macs:
+            device = table.get(mac)
+            slot = slots.get(mac)
+            if device is None:
+                if slot is not None:
+                    self._release(mac, slot)
+                    changed.add(mac)
+                continue
+            rxbytes = device.rxbytes or 0
+            txbytes = device.txbytes or 0
+            if slot is None:
+                slot = self._allocate(mac)
+                rx_counters[slot] = rxbytes
+                tx_counters[slot] = txbytes
+                changed.add(mac)
+                continue
+            rx_delta = rxbytes - rx_counters[slot]
+            tx_delta = txbytes - tx_counters[slot]
+            # counters start over when the client reconnects
+            if rx_delta < 0:
+                rx_delta = rxbytes
+            if tx_delta < 0:
+                tx_delta = txbytes
+            rx_counters[slot] = rxbytes
+            tx_counters[slot] = txbytes
+            if elapsed > 0 and (rx_delta or tx_delta):
+                rx = rx_delta / elapsed
+                tx = tx_delta / elapsed
+                moving.add(slot)
+            else:
+                rx = tx = 0.0
+            if rx != rx_rates[slot] or tx != tx_rates[slot]:
+                rx_rates[slot] = rx
+                tx_rates[slot] = tx
+                changed.add(mac)
+        for slot in self._moving - moving:
+            mac = self._macs[slot]
+            if mac is not None and mac not in changed:
+                rx_rates[slot] = tx_rates[slot] = 0.0
+                changed.add(mac)
+        self._moving = moving
+        self.changed = changed
+
+    def top(self, count: int) -> list[tuple[str, float, float]]:
+        """The busiest clients as (mac, rx, tx) by rx plus tx, a heap of count over the moving slots."""
+        rx, tx = self.rx, self.tx
+        slots = heapq.nlargest(count, self._moving, key=lambda slot: rx[slot] + tx[slot])
+        return [(self._macs[slot], self.rx[slot], self.tx[slot]) for slot in slots]
+
+    def _allocate(self, mac: str) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self._macs[slot] = mac
+            self.rx[slot] = self.tx[slot] = 0.0
+        else:
+            slot = len(self._macs)
+            self._macs.append(mac)
+            self._rxbytes.append(0)
+            self._txbytes.append(0)
+            self.rx.append(0.0)
+            self.tx.append(0.0)
+        self.slots[mac] = slot
+        return slot
+
+    def _release(self, mac: str, slot: int) -> None:
+        del self.slots[mac]
+        self._macs[slot] = None
+        self._moving.discard(slot)
+        self._free.append(slot)
+
 @dataclass
 class DataPortForwarding():
     name: str
@@ -69,6 +252,139 @@ INTERFACES_WIFI_NAME = {
     "WifiMaster1": "WiFi %s 5G"
 }
 
+class ConnectionStats:
+    """Connections opened and reused by a router session, with the connect and send marks of each request."""
+
+    def __init__(self) -> None:
+        self.opened = 0
+        self.reused = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(self._on_connection_create_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_request_headers_sent.append(self._on_request_sent)
+        trace_config.on_request_chunk_sent.append(self._on_request_sent)
+        return trace_config
+
+    async def _on_connection_create_start(self, session, context, params) -> None:
+        context.connect_start = time.perf_counter()
+
+    async def _on_connection_create_end(self, session, context, params) -> None:
+        self.opened += 1
+        if isinstance(context.trace_request_ctx, dict):
+            context.trace_request_ctx["connect"] = time.perf_counter() - context.connect_start
+
+    async def _on_connection_reuseconn(self, session, context, params) -> None:
+        self.reused += 1
+
+    async def _on_request_sent(self, session, context, params) -> None:
+        if isinstance(context.trace_request_ctx, dict):
+            context.trace_request_ctx["sent"] = time.perf_counter()
+
+    def as_dict(self) -> dict[str, int]:
+        return {"opened": self.opened, "reused": self.reused}
+
+
+class LatencyHistogram:
+    """Rolling window of latency samples in seconds."""
+
+    def __init__(self, size: int = 256) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+
+    def percentile(self, percent: float) -> float | None:
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": len(self._samples),
+            **{f"p{percent}": self.percentile(percent) for percent in LATENCY_PERCENTILES},
+        }
+
+
+class RequestTimings:
+    """Latency histograms of every RCI exchange by endpoint or timing key, by phase.
+
+    ttfb runs from the last byte of the request to the response headers, so it excludes connect.
+    """
+
+    PHASES = ("connect", "ttfb", "read", "decode", "total")
+
+    def __init__(self) -> None:
+        self._endpoints: dict[str, dict[str, LatencyHistogram]] = {}
+
+    def record(self, endpoint: str, timings: dict[str, float]) -> None:
+        histograms = self._endpoints.get(endpoint)
+        if histograms is None:
+            histograms = self._endpoints[endpoint] = {phase: LatencyHistogram() for phase in self.PHASES}
+        for phase in self.PHASES:
+            histograms[phase].add(timings.get(phase, 0.0))
+
+    def percentile(self, endpoint: str, phase: str, percent: float) -> float | None:
+        if endpoint not in self._endpoints:
+            return None
+        return self._endpoints[endpoint][phase].percentile(percent)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            endpoint: {phase: histogram.as_dict() for phase, histogram in histograms.items()}
+            for endpoint, histograms in self._endpoints.items()
+        }
+
+
+class CircuitBreaker:
+    """Closed, open or half-open state of the link to a router."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, backoff: float = 5, max_backoff: float = 600) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._failure_threshold = failure_threshold
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._trips = 0
+        self._retry_at = 0.0
+
+    @property
+    def retry_in(self) -> float:
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def probe_due(self) -> bool:
+        """Open long enough for one probe, which moves the breaker to half-open."""
+        if self.state != self.OPEN or self.retry_in > 0:
+            return False
+        self.state = self.HALF_OPEN
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trips = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self._failure_threshold:
+            self._trips += 1
+            delay = min(self._max_backoff, self._backoff * 2 ** (self._trips - 1))
+            self._retry_at = time.monotonic() + delay / 2 + random.uniform(0, delay / 2)
+            self.state = self.OPEN
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "retry_in": round(self.retry_in, 1)}
+
+
+IDENTITY_COMMANDS = ("show identification", "show version", "show system mode", "show interface")
+
 LIST_INTERFACES = [
     "UsbModem",
     "Davicom",
@@ -94,16 +410,35 @@ class Router:
         host="192.168.1.1", 
         port: int = 80, 
         ssl: bool | None = False,
+        connection_stats: ConnectionStats | None = None,
+        request_limiter: asyncio.Semaphore | None = None,
+        max_in_flight: int = MAX_IN_FLIGHT,
         ):
         self._session = session
+        self._request_limiter = request_limiter or contextlib.nullcontext()
+        self._router_limiter = asyncio.Semaphore(max_in_flight)
+        self._connection_stats = connection_stats or ConnectionStats()
+        self._breaker = CircuitBreaker()
+        self.request_timings = RequestTimings()
+        self.poll_timings: dict[str, float] = {}
+        self._last_timings: dict[str, float] = {}
+        self._last_auth_time = 0.0
         self.host = host
         self.url_router = f'{host}:{port}'
         self._username = username
         self._password = password
         self.request_interface = {}
+        self._tables: dict[str, Any] = {}
+
+        self._auth_saved = 0
+        self._auth_forced = 0
+        self._auth_lock = asyncio.Lock()
+        self._auth_generation = 0
+        self._auth_cookies: dict[str, str] = {}
 
         self._mac = ""
         self._serial_number = ""
+        self._vendor = ""
         self._model = ""
         self._hw_type = ""
         self._hw_id = ""
@@ -127,26 +462,59 @@ class Router:
     @property
     def name_device(self):
         return self._name_device
+    @property
+    def auth_stats(self):
+        return {"saved": self._auth_saved, "forced": self._auth_forced}
+    @property
+    def connection_stats(self):
+        return self._connection_stats.as_dict()
+    @property
+    def breaker(self):
+        return self._breaker.as_dict()
 
 
-    async def async_setup_obj(self):
-        await self.auth()
-
-        data_show_identification = await self.show_identification()
-        self._mac = data_show_identification["mac"]
-        self._serial_number = data_show_identification["serial"]
+    @property
+    def identity(self) -> dict[str, Any]:
+        return {
+            "mac": self._mac,
+            "serial": self._serial_number,
+            "vendor": self._vendor,
+            "model": self._model,
+            "hw_id": self._hw_id,
+            "device": self._name_device,
+            "hw_type": self._hw_type,
+            "request_interface": dict(self.request_interface),
+        }
 
-        data_show_version = await self.show_version()
-        self._model = data_show_version["model"]
-        self._hw_id = data_show_version["hw_id"]
-        self._name_device = data_show_version["device"]
+    def apply_identity(self, identity: Mapping[str, Any]) -> None:
+        self._mac = identity["mac"]
+        self._serial_number = identity["serial"]
+        self._vendor = identity["vendor"]
+        self._model = identity["model"]
+        self._hw_id = identity["hw_id"]
+        self._name_device = identity["device"]
+        self._hw_type = identity["hw_type"]
+        self.request_interface = dict(identity["request_interface"])
 
-        data_show_system_mode = await self.show_system_mode()
-        self._hw_type = data_show_system_mode["active"]
+    async def async_setup_obj(self, identity: Mapping[str, Any] | None = None):
+        """Set up from a cached identity, or identify the router."""
+        if identity is not None:
+            self.apply_identity(identity)
+        else:
+            await self.async_identify()
+        _LOGGER.debug(f'{self._mac} request_interface - {self.request_interface}')
+        return True
 
-        if self._hw_type == "router":
-            # data_show_rc_interface_ip_global = await self.show_rc_interface_ip_global()
-            data_show_interface = await self.show_interface()
+    async def async_identify(self) -> dict[str, Any]:
+        """Identification, version, mode and WAN interfaces in one RCI batch."""
+        response = await self.api("post", "/rci/", json=[rci_query(command) for command in IDENTITY_COMMANDS])
+        if not isinstance(response, list):
+            raise Exception(f"async_identify status {response.status}")
+        data_show_identification, data_show_version, data_show_system_mode, data_show_interface = (
+            rci_extract(data, command) for data, command in zip(response, IDENTITY_COMMANDS)
+        )
+        request_interface = {}
+        if data_show_system_mode["active"] == "router":
             for interface, data_interface in data_show_interface.items():
                 if (
                     (
@@ -155,10 +523,22 @@ class Router:
                     )
                     or data_interface.get('global', False)
                     ):
-                    self.request_interface[interface] = f"{data_interface['type']} {data_interface.get('description', '')}"
-        _LOGGER.debug(f'{self._mac} request_interface - {self.request_interface}')
-        return True
+                    request_interface[interface] = f"{data_interface['type']} {data_interface.get('description', '')}"
+        self.apply_identity({
+            "mac": data_show_identification["mac"],
+            "serial": data_show_identification["serial"],
+            "vendor": data_show_version.get("vendor", "Keenetic"),
+            "model": data_show_version["model"],
+            "hw_id": data_show_version["hw_id"],
+            "device": data_show_version["device"],
+            "hw_type": data_show_system_mode["active"],
+            "request_interface": request_interface,
+        })
+        return self.identity
+
 
+    async def async_close(self):
+        await self._session.close()
 
     async def async_download_file(self, download_url, folder):
         try:
@@ -173,39 +553,112 @@ class Router:
             raise Exception("TimeoutError") from err
         return True
 
-    async def reguest_api(self, method: str, endpoint: str, json: Mapping[str, Any] | None = None, headers: str | None = None) -> tuple[aiohttp.ClientResponse]:
+    async def reguest_api(self, method: str, endpoint: str, json: Mapping[str, Any] | None = None, headers: str | None = None, raw: bool = False, timeout: float | None = None, timing_key: str | None = None, cookies: Mapping[str, str] | None = None) -> tuple[aiohttp.ClientResponse]:
         url = self.url_router + endpoint
+        kwargs = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout is not None else {}
+        if cookies:
+            kwargs["cookies"] = cookies
+        timings = {}
         try:
             _LOGGER.debug(f'{self._mac} request - {endpoint} - {json}')
-            async with self._session.request(method=method, url=url, json=json, headers=headers) as res:
-                if res.status == 200 and res.content_type == 'application/json':
-                    result = await res.json()
-                elif res.status == 200 and res.content_type == 'application/javascript':
-                    result = await res.text()
-                    result = self.data_parser(result)
-                else:
-                    result = res
-                _LOGGER.debug(f'{self._mac} status - {endpoint} {res.status}')
+            async with self._router_limiter, self._request_limiter:
+                start = time.perf_counter()
+                async with self._session.request(method=method, url=url, json=json, headers=headers, trace_request_ctx=timings, **kwargs) as res:
+                    received = time.perf_counter()
+                    timings["ttfb"] = received - timings.pop("sent", start)
+                    await res.read()
+                    timings["read"] = time.perf_counter() - received
+                    if res.status == 200 and res.content_type == 'application/json' and raw:
+                        result = await res.text()
+                    elif res.status == 200 and res.content_type == 'application/json':
+                        result = await res.json()
+                    elif res.status == 200 and res.content_type == 'application/javascript':
+                        result = await res.text()
+                        result = self.data_parser(result)
+                    else:
+                        result = res
+                    timings["total"] = time.perf_counter() - start
+                    timings["decode"] = timings["total"] - (received - start) - timings["read"]
+                    _LOGGER.debug(f'{self._mac} status - {endpoint} {res.status}')
         except asyncio.TimeoutError as err:
+            self._breaker.record_failure()
             raise Exception("TimeoutError") from err
+        except aiohttp.ClientError:
+            self._breaker.record_failure()
+            raise
+        self._breaker.record_success()
+        self.request_timings.record(timing_key or endpoint.split("?")[0], timings)
+        self._last_timings = timings
+        return result
+
+    async def async_probe(self):
+        """Cheap /auth request letting a request through an open breaker."""
+        if not self._breaker.probe_due():
+            raise Exception(f"{self._mac} router unreachable, next probe in {self._breaker.retry_in:.0f}s")
+        _LOGGER.debug(f'{self._mac} probe router')
+        try:
+            await self.reguest_api("get", "/auth", timeout=PROBE_TIMEOUT)
+        except BaseException:
+            # any failure of the probe, cancellation included, opens the breaker again
+            if self._breaker.state == CircuitBreaker.HALF_OPEN:
+                self._breaker.record_failure()
+            raise
+
+    async def api(self, method: str, endpoint: str, json: Mapping[str, Any] | None = {}, raw: bool = False, timing_key: str | None = None):
+        if self._breaker.state != CircuitBreaker.CLOSED:
+            await self.async_probe()
+        start = time.perf_counter()
+        if self.session_valid():
+            self._auth_saved += 1
+        else:
+            await self._async_auth()
+        self._last_auth_time = time.perf_counter() - start
+        generation = self._auth_generation
+        result = await self.reguest_api(method, endpoint, json, raw=raw, timing_key=timing_key)
+        if isinstance(result, aiohttp.ClientResponse) and result.status == 401:
+            _LOGGER.debug(f'{self._mac} session expired - {endpoint}')
+            self._auth_forced += 1
+            start = time.perf_counter()
+            await self._async_auth(result, generation)
+            self._last_auth_time += time.perf_counter() - start
+            result = await self.reguest_api(method, endpoint, json, raw=raw, timing_key=timing_key)
         return result
 
+    def session_valid(self) -> bool:
+        """The cookie jar still holds a session for the router."""
+        return len(self._session.cookie_jar.filter_cookies(URL(self.url_router))) > 0
 
+    def _session_cookies(self) -> dict[str, str]:
+        return {name: morsel.value for name, morsel in self._session.cookie_jar.filter_cookies(URL(self.url_router)).items()}
 
-    async def api(self, method: str, endpoint: str, json: Mapping[str, Any] | None = {}):
-        resp = await self.auth()
-        return await self.reguest_api(method, endpoint, json)
+    async def _async_auth(self, response: aiohttp.ClientResponse | None = None, generation: int | None = None) -> None:
+        """auth() one request at a time, skipped when another request logged in since generation."""
+        async with self._auth_lock:
+            if generation is not None and generation != self._auth_generation:
+                # a 401 answered after that login replaces its session cookie, put it back
+                self._session.cookie_jar.update_cookies(self._auth_cookies, URL(self.url_router))
+                return
+            if generation is None and self.session_valid():
+                return
+            await self.auth(response)
+            self._auth_generation += 1
 
-    async def auth(self):
-        response = await self.reguest_api("get", "/auth")
+    async def auth(self, response: aiohttp.ClientResponse | None = None):
+        if response is None or "X-NDM-Challenge" not in response.headers:
+            response = await self.reguest_api("get", "/auth")
         if response.status == 401:
             password = f"{self._username}:{response.headers['X-NDM-Realm']}:{self._password}"
             password = md5(password.encode("utf-8"))
             password = response.headers["X-NDM-Challenge"] + password.hexdigest()
             password = sha256(password.encode("utf-8")).hexdigest()
-            response = await self.reguest_api("post", "/auth", json={"login": self._username, "password": password})
+            # the challenge goes with the session cookie of its 401, which another 401 may have replaced in the jar
+            cookies = {name: morsel.value for name, morsel in response.cookies.items()}
+            response = await self.reguest_api("post", "/auth", json={"login": self._username, "password": password}, cookies=cookies)
             if response.status == 401:
                 raise Exception(response)
+            if cookies:
+                self._session.cookie_jar.update_cookies(cookies, URL(self.url_router))
+        self._auth_cookies = self._session_cookies()
         return response.status == 200
 
     async def components_list(self):
@@ -276,6 +729,9 @@ class Router:
             )
         return interface_wifi
 
+    async def show_log(self, max_lines: int):
+        return await self.api("post", "/rci/", [rci_query("show log", {"max-lines": max_lines})])
+
     async def show_associations(self):
         return await self.api("get", "/rci/show/associations")
 
@@ -321,18 +777,7 @@ class Router:
         return await self.api("post", f"/rci/system/usb", data_send)
 
     def data_parser(self, data):
-        new_data = {}
-        data = data.replace('\n\t', '').replace('\n', '')
-        data = data.split(';')
-        for row in data:
-            if row != '':
-                row = row.split('=')
-                nu = row[0].rstrip()
-                te = row[1].lstrip()
-                if '{' not in te:
-                    te = te.replace('"', '')
-                new_data[nu] = te
-        return new_data
+        return parse_js_assignments(data)
 
     async def show_stat_interface(self, stat_interfaces: list = None):
         stat_interfaces = stat_interfaces or self.request_interface
@@ -346,86 +791,371 @@ class Router:
             stat_interface[row] = data_show_stat_interface[idx]['show']['interface']['stat']
         return stat_interface
 
-    async def custom_request(self):
-        data_json_send=[]
-        data_json_send.append({"show": {"system": {}}},)
-        data_json_send.append({"show": {"interface": {}}})
-        data_json_send.append({"show": {"associations": {}}})
-        data_json_send.append({"show": {"rc": {"system": {}}}})
-        data_json_send.append({"show": {"rc": {"ip": {"http": {}}}}})
-        data_json_send.append({"show": {"media": {}}})
-
-        if self.hw_type == "router":
-            data_json_send.append({"show": {"ip": {"hotspot": {}}}})
-            data_json_send.append({"show": {"rc": {"interface": {"ip": {"global": {}}}}}})
-            data_json_send.append({"show": {"rc": {"ip": {"static": {}}}}})
-            data_json_send.append({"show": {"rc": {"ip": {"hotspot": {}}}}})
-
-        full_info_other = await self.api("post", "/rci/", json=data_json_send)
-
-        show_system = full_info_other[0]['show']['system']
-        show_interface = full_info_other[1]['show']['interface']
-        show_associations = full_info_other[2]['show']['associations']
-        show_rc_system_usb = full_info_other[3]['show']['rc']['system'].get('usb', [])
-        show_rc_ip_http = full_info_other[4]['show']['rc']['ip']['http']
-        show_media = full_info_other[5]['show'].get('media', {})
-
-        show_ip_hotspot = {}
-        show_rc_ip_static = {}
-        show_ip_hotspot_policy = {}
-        priority_interface = {}
-
-
-        if self.hw_type == "router":
-            data_show_ip_hotspot = full_info_other[6]['show']['ip']['hotspot']['host']
-            for hotspot in data_show_ip_hotspot:
-                show_ip_hotspot[hotspot["mac"]] = DataDevice(
-                    hotspot.get('mac'), 
-                    hotspot.get('name'), 
-                    hotspot.get('hostname'), 
-                    hotspot.get('ip'), 
-                    hotspot.get('active'), 
-                    hotspot.get('interface', {"id": None}).get('id'),
-                    hotspot.get('uptime'), 
-                    hotspot.get('rssi'), 
-                    hotspot.get('rxbytes'), 
-                    hotspot.get('txbytes'), 
-                )
-            
-            priority_interface = full_info_other[7]['show']['rc']['interface']['ip']['global']
-
-            data_show_rc_ip_static = full_info_other[8]['show']['rc']['ip']['static']
-            for port_frw in data_show_rc_ip_static:
-                nm_pfrw = port_frw.get('comment', port_frw.get('index'))
-                nm_pfrw = nm_pfrw if nm_pfrw != "" else port_frw.get('index')
-                show_rc_ip_static[port_frw["index"]] = DataPortForwarding(
-                    nm_pfrw, 
-                    port_frw.get('interface'), 
-                    port_frw.get('protocol'), 
-                    port_frw.get('port'), 
-                    port_frw.get('end-port', port_frw.get('port')), 
-                    port_frw.get('to-host'), 
-                    port_frw.get('index'), 
-                    port_frw.get('comment', None), 
-                    port_frw.get('disable', False), 
-                )
-
-            data_show_ip_hotspot_policy = full_info_other[9]['show']['rc']['ip']['hotspot']['host']
-            for hotspot_pl in data_show_ip_hotspot_policy:
-                show_ip_hotspot_policy[hotspot_pl["mac"]] = hotspot_pl
-
-        stat_interface = await self.show_stat_interface()
-
-        return KeeneticFullData(
-            show_system,
-            show_ip_hotspot, 
-            show_interface, 
-            show_rc_ip_static, 
-            show_associations, 
-            show_ip_hotspot_policy,
-            priority_interface,
-            show_rc_ip_http,
-            show_rc_system_usb,
-            show_media,
-            stat_interface,
-            )
+    def plan_request(self, sections: set[str] | None = None) -> list[tuple[str, str | None, dict[str, Any]]]:
+        """One RCI batch with everything a poll needs, or only the given sections."""
+        plan = []
+        for name, section in RCI_SECTIONS.items():
+            if section.router_only and self.hw_type != "router":
+                continue
+            if sections is not None and name not in sections and name != "show_system":
+                continue
+            plan.append((name, None, rci_query(section.command)))
+        if sections is not None and "stat_interface" not in sections:
+            return plan
+        for interface in self.request_interface:
+            plan.append(("stat_interface", interface, rci_query("show interface stat", {"name": interface})))
+        return plan
+
+    def restore_full_data(self, snapshot: Mapping[str, Any]) -> KeeneticFullData:
+        """KeeneticFullData from snapshot_full_data(), seeding the tables later polls update in place."""
+        full_data = KeeneticFullData(**{
+            item.name: snapshot[item.name] for item in fields(KeeneticFullData) if item.name in snapshot
+        })
+        table = HotspotTable()
+        for row in snapshot.get("show_ip_hotspot", []):
+            table[intern(row[0])] = DataDevice(*row)
+        table.changed = set(table)
+        full_data.show_ip_hotspot = self._tables["show_ip_hotspot"] = table
+        full_data.show_rc_ip_static = rows_to_records(DataPortForwarding, snapshot.get("show_rc_ip_static", {}))
+        return full_data
+
+    def unpack_response(self, plan: list[tuple[str, str | None, dict[str, Any]]], response: Iterable[dict[str, Any]]) -> KeeneticFullData:
+        """Split a batch response back into KeeneticFullData, decoding one section at a time."""
+        full_data = {"stat_interface": {}}
+        for (name, interface, _), data in zip(plan, response):
+            if name == "stat_interface":
+                full_data[name][interface] = rci_extract(data, "show interface stat")
+                continue
+            section = RCI_SECTIONS[name]
+            value = rci_extract(data, section.command, section.item, section.default())
+            if section.parser is not None:
+                value = self._tables[name] = section.parser(value, self._tables.get(name))
+            full_data[name] = value
+        full_data.setdefault("show_ip_hotspot", self._tables.get("show_ip_hotspot"))
+        return KeeneticFullData(**full_data)
+
+    async def custom_request(self, sections: set[str] | None = None, timing_key: str | None = None):
+        plan = self.plan_request(sections)
+        response = await self.api("post", "/rci/", json=[query for _, _, query in plan], raw=True, timing_key=timing_key)
+        if not isinstance(response, str):
+            raise Exception(f"custom_request status {response.status}")
+        poll_timings = {"auth": self._last_auth_time, "network": self._last_timings.get("total", 0.0)}
+        start = time.perf_counter()
+        batch = iter_rci_batch(response, rci_array_paths(plan))
+        full_data = self.unpack_response(plan, timed_iter(batch, poll_timings, "decode"))
+        poll_timings["build"] = time.perf_counter() - start - poll_timings["decode"]
+        self.poll_timings = poll_timings
+        return full_data
+
+
+def timed_iter(iterator: Iterator[Any], timings: dict[str, float], key: str) -> Iterator[Any]:
+    """Accumulate the time spent producing items into timings[key]."""
+    timings[key] = 0.0
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            timings[key] += time.perf_counter() - start
+            return
+        timings[key] += time.perf_counter() - start
+        yield item
+
+
+def iter_rci_batch(text: str, arrays: Sequence[tuple[str, ...] | None] = ()) -> Iterator[Any]:
+    """Decode per section from a buffered batch body, keeping one section tree alive at a time.
+
+    The body itself is read whole. For an element with a path in arrays, the array at that path
+    is a generator decoding one record at a time, so the large tables are built without their
+    list of dicts; records decoded that way count in the time of whoever consumes them.
+    """
+    reader = _RciReader(text)
+    if not reader.enter("["):
+        raise ValueError("RCI batch response is not an array")
+    for index in count():
+        if reader.leave("]"):
+            return
+        path = arrays[index] if index < len(arrays) else None
+        if path is None:
+            yield reader.decode()
+            continue
+        yield reader.element(path)
+        reader.finish()
+
+
+def rci_array_paths(plan: Sequence[tuple[str, str | None, dict[str, Any]]]) -> list[tuple[str, ...] | None]:
+    """Path of the record array of each parsed section in a batch plan, for iter_rci_batch."""
+    paths = []
+    for name, _, _ in plan:
+        section = RCI_SECTIONS.get(name)
+        if section is None or section.parser is None:
+            paths.append(None)
+        else:
+            paths.append((*section.command.split(), *((section.item,) if section.item is not None else ())))
+    return paths
+
+
+class _RciReader:
+    """Position in a buffered batch body, decoding values or walking objects key by key."""
+
+    __slots__ = ("_text", "_idx", "_open", "_records")
+
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self._idx = 0
+        self._open = 0
+        self._records: Iterator[Any] | None = None
+
+    def enter(self, char: str) -> bool:
+        self._idx = _RCI_SEPARATOR.match(self._text, self._idx).end()
+        if not self._text.startswith(char, self._idx):
+            return False
+        self._idx += 1
+        return True
+
+    def leave(self, char: str) -> bool:
+        """Consume char closing the current object or array, also true at the end of the text."""
+        self._idx = _RCI_SEPARATOR.match(self._text, self._idx).end()
+        if self._idx >= len(self._text):
+            return True
+        return self.enter(char)
+
+    def decode(self) -> Any:
+        self._idx = _RCI_SEPARATOR.match(self._text, self._idx).end()
+        value, self._idx = _RCI_DECODER.raw_decode(self._text, self._idx)
+        return value
+
+    def key(self) -> str | None:
+        """Next key of the innermost open object, None once the object is closed."""
+        if self.leave("}"):
+            self._open -= 1
+            return None
+        key = self.decode()
+        self._idx = _RCI_COLON.match(self._text, self._idx).end()
+        return key
+
+    def element(self, path: tuple[str, ...]) -> Any:
+        """The element down to path with the array there as a generator of its records.
+
+        Keys before the path are decoded, the ones after it are skipped by finish().
+        """
+        if not self.enter("{"):
+            return self.decode()
+        self._open = 1
+        root = node = {}
+        for depth, word in enumerate(path, 1):
+            while (key := self.key()) is not None:
+                if key != word:
+                    node[key] = self.decode()
+                elif depth < len(path) and self.enter("{"):
+                    self._open += 1
+                    node[key] = node = {}
+                    break
+                elif depth == len(path) and self.enter("["):
+                    node[key] = self._records = self._iter_records()
+                    return root
+                else:
+                    node[key] = self.decode()
+            else:
+                return root
+        return root
+
+    def _iter_records(self) -> Iterator[Any]:
+        text, separator, decode = self._text, _RCI_SEPARATOR.match, _RCI_DECODER.raw_decode
+        end = len(text)
+        idx = separator(text, self._idx).end()
+        while idx < end and text[idx] != "]":
+            record, idx = decode(text, idx)
+            idx = separator(text, idx).end()
+            yield record
+        self._idx = idx + 1
+
+    def finish(self) -> None:
+        """Skip what element() left of the current element."""
+        if self._records is not None:
+            deque(self._records, maxlen=0)
+            self._records = None
+        while self._open:
+            if self.key() is not None:
+                self.decode()
+
+
+def parse_js_assignments(text: str) -> dict[str, str]:
+    """`name = value;` statements of a JS-typed response, string values unquoted."""
+    if _js_plain(text):
+        return {
+            name.strip(): value.strip().replace("\n\t", "").replace("\n", "") if "{" in value else value.replace('"', "").strip()
+            for name, sep, value in map(str.partition, text.split(";"), repeat("="))
+            if sep
+        }
+    return parse_js_statements(text)
+
+def _js_plain(text: str) -> bool:
+    """Whether splitting at ';' and the first '=' is exact: no escapes, comments or ';' inside a string."""
+    if "\\" in text or "'" in text or "`" in text:
+        return False
+    if "/" in text and ("/*" in text or text.count("//") != text.count("://")):
+        return False
+    return _JS_SPLIT_STRING.search(text) is None
+
+def parse_js_statements(text: str) -> dict[str, str]:
+    """parse_js_assignments token by token, for strings, comments and literals nested to any depth.
+
+    Comments are dropped, also inside literals.
+    """
+    statements = {}
+    name = None
+    parts: list[str] = []
+    depth = 0
+    for token, char in _JS_TOKEN.findall(text):
+        if not token:
+            if not char:
+                continue
+            token = char
+        if depth == 0 and token == ";":
+            if name:
+                statements[name] = _js_statement_value(parts)
+            name, parts = None, []
+        elif depth == 0 and token == "=" and name is None:
+            name, parts = "".join(parts).strip(), []
+        else:
+            if token in _JS_OPEN:
+                depth += 1
+            elif token in _JS_CLOSE:
+                depth = max(0, depth - 1)
+            parts.append(token)
+    if name:
+        statements[name] = _js_statement_value(parts)
+    return statements
+
+def _js_statement_value(parts: list[str]) -> str:
+    """A value of a single string unquoted, anything else as js_value."""
+    value = "".join(parts)
+    string = _JS_STRING_VALUE.fullmatch(value)
+    return js_string(string.group(1)) if string else js_value(value)
+
+def js_value(value: str) -> str:
+    if "{" in value:
+        return value.strip().replace("\n\t", "").replace("\n", "")
+    return value.replace('"', "").strip()
+
+def js_string(value: str) -> str:
+    if "\\" not in value:
+        return value[1:-1]
+    try:
+        return loads(value) if value[0] == '"' else value[1:-1]
+    except ValueError:
+        return value[1:-1]
+
+def rci_query(command: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+    """'show ip hotspot' -> {"show": {"ip": {"hotspot": {}}}}."""
+    query = params or {}
+    for word in reversed(command.split()):
+        query = {word: query}
+    return query
+
+def records_to_rows(records: Mapping[str, Any]) -> dict[str, list[Any]]:
+    return {key: list(astuple(record)) for key, record in records.items()}
+
+def rows_to_records(cls: type, rows: Mapping[str, list[Any]]) -> dict[str, Any]:
+    return {key: cls(*row) for key, row in rows.items()}
+
+def snapshot_full_data(full_data: KeeneticFullData) -> dict[str, Any]:
+    """Compact JSON form of KeeneticFullData, dataclass records stored as field lists."""
+    snapshot = {item.name: getattr(full_data, item.name) for item in fields(KeeneticFullData)}
+    snapshot["show_ip_hotspot"] = [
+        [getattr(device, name) for name in DataDevice.__slots__] for device in (full_data.show_ip_hotspot or {}).values()
+    ]
+    snapshot["show_rc_ip_static"] = records_to_rows(full_data.show_rc_ip_static)
+    return snapshot
+
+def rci_extract(data: dict[str, Any], command: str, item: str | None = None, default: Any = None) -> Any:
+    """Walk a batch element down the words of its command."""
+    for word in command.split():
+        data = data.get(word, {})
+    if item is not None:
+        data = data.get(item, default)
+    return data
+
+def parse_hotspot(data_show_ip_hotspot: list[dict[str, Any]], table: HotspotTable | None = None) -> HotspotTable:
+    table = table if table is not None else HotspotTable()
+    return table.update_hosts(data_show_ip_hotspot)
+
+def parse_rc_ip_static(data_show_rc_ip_static: list[dict[str, Any]], previous: Any = None) -> dict[str, DataPortForwarding]:
+    show_rc_ip_static = {}
+    for port_frw in data_show_rc_ip_static:
+        nm_pfrw = port_frw.get('comment', port_frw.get('index'))
+        nm_pfrw = nm_pfrw if nm_pfrw != "" else port_frw.get('index')
+        show_rc_ip_static[port_frw["index"]] = DataPortForwarding(
+            nm_pfrw, 
+            port_frw.get('interface'), 
+            port_frw.get('protocol'), 
+            port_frw.get('port'), 
+            port_frw.get('end-port', port_frw.get('port')), 
+            port_frw.get('to-host'), 
+            port_frw.get('index'), 
+            port_frw.get('comment', None), 
+            port_frw.get('disable', False), 
+        )
+    return show_rc_ip_static
+
+@dataclass(slots=True)
+class LogPresence:
+    index: int
+    mac: str
+    active: bool
+    ip: str | None = None
+
+def parse_log_presence(data_show_log: list[dict[str, Any]], last_index: int) -> tuple[list[LogPresence], int]:
+    """Presence updates from the log lines newer than last_index, and the newest index seen."""
+    log = rci_extract(data_show_log[0], "show log", "log", {}) if data_show_log else {}
+    lines = log.values() if isinstance(log, dict) else log
+    lines = [(int(line.get("id", -1)), line) for line in lines]
+    newest = max((index for index, _ in lines), default=last_index)
+    if newest < last_index:
+        # the log was cleared or the router rebooted, start over from its tail
+        return [], newest
+    events = []
+    for index, line in lines:
+        if index <= last_index:
+            continue
+        message = line.get("message", "")
+        if isinstance(message, dict):
+            message = message.get("message", "")
+        if (match := _LOG_STA.search(message)) is not None:
+            active = match["action"] not in ("disassociated", "deauthenticated")
+            events.append(LogPresence(index, match["mac"].lower(), active))
+        elif _LOG_DHCPACK.search(message) and (mac := _LOG_MAC.search(message)) is not None:
+            ip = _LOG_IP.search(message)
+            events.append(LogPresence(index, mac.group().lower(), True, ip.group() if ip else None))
+    events.sort(key=lambda event: event.index)
+    return events, newest
+
+def parse_hotspot_policy(data_show_ip_hotspot_policy: list[dict[str, Any]], previous: Any = None) -> dict[str, Any]:
+    return {hotspot_pl["mac"]: hotspot_pl for hotspot_pl in data_show_ip_hotspot_policy}
+
+
+@dataclass(frozen=True)
+class RciSection:
+    command: str
+    item: str | None = None
+    default: Callable[[], Any] = dict
+    parser: Callable[[Any, Any], Any] | None = None
+    router_only: bool = False
+    running_config: bool = False
+
+
+RCI_SECTIONS: dict[str, RciSection] = {
+    "show_system": RciSection("show system"),
+    "show_interface": RciSection("show interface"),
+    "show_associations": RciSection("show associations"),
+    "show_rc_system_usb": RciSection("show rc system", "usb", list, running_config=True),
+    "show_rc_ip_http": RciSection("show rc ip http", running_config=True),
+    "show_media": RciSection("show media"),
+    "show_ip_hotspot": RciSection("show ip hotspot", "host", list, parse_hotspot, True),
+    "priority_interface": RciSection("show rc interface ip global", router_only=True, running_config=True),
+    "show_rc_ip_static": RciSection("show rc ip static", None, list, parse_rc_ip_static, True, True),
+    "show_ip_hotspot_policy": RciSection("show rc ip hotspot", "host", list, parse_hotspot_policy, True, True),
+}
+
+RC_SECTIONS: frozenset[str] = frozenset(name for name, section in RCI_SECTIONS.items() if section.running_config)
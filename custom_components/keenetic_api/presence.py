@@ -0,0 +1,123 @@
+"""Client presence of a Keenetic router, diffed from poll to poll."""
+
+from __future__ import annotations
+from collections.abc import Callable
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .keenetic import DataDevice, HotspotTable, LogPresence
+from .const import (
+    EVENT_CLIENT_JOIN,
+    EVENT_CLIENT_LEAVE,
+    EVENT_CLIENT_ROAM,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PresenceEngine:
+    """Join, leave and roam of hotspot clients keyed by mac, with per-mac subscriptions."""
+
+    def __init__(self, hass: HomeAssistant, router_mac: str) -> None:
+        self._hass = hass
+        self._router_mac = router_mac
+        self._present: dict[str, str | None] = {}
+        self._tentative: dict[str, bool] = {}
+        self._known: set[str] = set()
+        self._baseline = False
+        self._subscribers: dict[str, list[CALLBACK_TYPE]] = {}
+        self._new_clients: list[Callable[[set[str]], None]] = []
+
+    def is_connected(self, mac: str) -> bool:
+        tentative = self._tentative.get(mac)
+        return tentative if tentative is not None else mac in self._present
+
+    @callback
+    def async_subscribe(self, mac: str, update: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update whenever the record of the mac changes."""
+        self._subscribers.setdefault(mac, []).append(update)
+
+        @callback
+        def async_unsubscribe() -> None:
+            self._subscribers[mac].remove(update)
+            if not self._subscribers[mac]:
+                del self._subscribers[mac]
+
+        return async_unsubscribe
+
+    @callback
+    def async_subscribe_new_clients(self, update: Callable[[set[str]], None]) -> CALLBACK_TYPE:
+        """Call update with the macs that appear in the hotspot table for the first time."""
+        self._new_clients.append(update)
+        return lambda: self._new_clients.remove(update)
+
+    @callback
+    def async_set_baseline(self, table: HotspotTable) -> None:
+        """Take the table as the known state without firing events, e.g. at startup."""
+        self._present = {mac: device.interface_id for mac, device in table.items() if device.active}
+        self._known = set(table)
+        self._tentative = {}
+        self._baseline = True
+
+    @callback
+    def async_update(self, table: HotspotTable) -> None:
+        """Diff the macs changed by the last poll, or seen in the log since, against the reported state."""
+        if not self._baseline:
+            self.async_set_baseline(table)
+            return
+        tentative, self._tentative = self._tentative, {}
+        new_clients = set()
+        for mac in table.changed | tentative.keys():
+            device = table.get(mac)
+            if device is not None and mac not in self._known:
+                self._known.add(mac)
+                new_clients.add(mac)
+            self._diff(mac, device, tentative.get(mac))
+            for update in self._subscribers.get(mac, ()):
+                update()
+        if new_clients:
+            for update in self._new_clients:
+                update(new_clients)
+
+    @callback
+    def async_apply_log(self, events: list[LogPresence]) -> bool:
+        """Tentative presence from the router log until the next poll, whether any client changed."""
+        if not self._baseline:
+            return False
+        changed = False
+        for event in events:
+            if self.is_connected(event.mac) == event.active:
+                continue
+            self._tentative[event.mac] = event.active
+            changed = True
+            for update in self._subscribers.get(event.mac, ()):
+                update()
+        return changed
+
+    def _diff(self, mac: str, device: DataDevice | None, tentative: bool | None = None) -> None:
+        active = device is not None and device.active
+        source = "log" if tentative == active else "poll"
+        if mac not in self._present:
+            if active:
+                self._present[mac] = device.interface_id
+                self._fire(EVENT_CLIENT_JOIN, mac, device, source=source)
+        elif not active:
+            del self._present[mac]
+            self._fire(EVENT_CLIENT_LEAVE, mac, device, source=source)
+        elif self._present[mac] != device.interface_id:
+            previous = self._present[mac]
+            self._present[mac] = device.interface_id
+            self._fire(EVENT_CLIENT_ROAM, mac, device, source="poll", previous_interface=previous)
+
+    def _fire(self, event_type: str, mac: str, device: DataDevice | None, **data) -> None:
+        _LOGGER.debug(f"{self._router_mac} {event_type} {mac}")
+        event_data = {"router": self._router_mac, "mac": mac}
+        if device is not None:
+            event_data |= {
+                "name": device.name or device.hostname,
+                "ip": device.ip,
+                "interface": device.interface_id,
+            }
+        event_data |= data
+        self._hass.bus.async_fire(event_type, event_data)
@@ -11,7 +11,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo, format_mac
 from homeassistant.helpers.typing import StateType
 
@@ -25,6 +24,7 @@ from .const import (
     POLICY_NOT_INTERNET,
 )
 from .coordinator import KeeneticRouterCoordinator
+from .entity import KeeneticEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -56,11 +56,12 @@ async def async_setup_entry(
     async_add_entities(selects)
 
 
-class KeeneticPolicySelectEntity(CoordinatorEntity[KeeneticRouterCoordinator], SelectEntity):
+class KeeneticPolicySelectEntity(KeeneticEntity, SelectEntity):
 
     _attr_entity_category = EntityCategory.CONFIG
     _attr_has_entity_name = True
     _attr_translation_key = "client_policy"
+    _rci_sections = ("show_ip_hotspot_policy",)
 
     def __init__(
         self,
@@ -71,6 +72,7 @@ class KeeneticPolicySelectEntity(CoordinatorEntity[KeeneticRouterCoordinator], S
         super().__init__(coordinator)
         self._client = client
         self._mac = format_mac(client.mac)
+        self._rci_record = self._mac
         self._hostname = client.name or client.hostname
         self._attr_unique_id = f"{coordinator.unique_id}_select_client_policy_{self._mac}"
         self._select_options = select_options
@@ -105,7 +107,7 @@ class KeeneticPolicySelectEntity(CoordinatorEntity[KeeneticRouterCoordinator], S
             new_option = "permit"
             policy = [row for row in self._select_options if self._select_options[row] == option][0]
         resp = await self.coordinator.router.ip_hotspot_host_policy(self._mac, new_option, policy)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_config_refresh()
 
     @property
     def available(self) -> bool:
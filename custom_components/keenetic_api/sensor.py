@@ -5,6 +5,7 @@ from collections.abc import Callable
 from typing import Any
 from datetime import UTC, datetime, timedelta
 import logging
+import time
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -25,15 +26,20 @@ from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers import device_registry as dr
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .coordinator import KeeneticRouterCoordinator
-from .keenetic import KeeneticFullData
+from .entity import KeeneticEntity
+from .keenetic import KeeneticFullData, RequestTimings
 from .const import (
     DOMAIN,
     COORD_FULL,
+    CONF_SELECT_CLIENT_RATE,
+    CONF_TOP_TALKERS,
+    DEFAULT_TOP_TALKERS,
+    TIMING_POLL,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -45,7 +51,16 @@ class KeeneticRouterSensorEntityDescription(SensorEntityDescription):
     value: Callable[[KeeneticFullData, Any], Any] = (
         lambda coordinator, key: coordinator.data.show_system[key] if coordinator.data.show_system[key] is not None else None
     )
-    attributes_fn: Callable[[KeeneticFullData], dict[str, Any]] | None = None
+    attributes_fn: Callable[[KeeneticRouterCoordinator, Any], dict[str, Any]] | None = None
+    sections: tuple[str, ...] | None = ("show_system",)
+    record: bool = True
+    changed_fn: Callable[[KeeneticRouterCoordinator, Any], bool] | None = None
+    # a changed value is written once it moves from the last written one by at least the
+    # larger of deadband (absolute) and deadband_percent (of the written value), so both
+    # must be exceeded; never sooner than min_write_interval (seconds) after the last write
+    deadband: float | None = None
+    deadband_percent: float | None = None
+    min_write_interval: float | None = None
 
 
 def convert_uptime(uptime: int) -> datetime:
@@ -75,12 +90,44 @@ def ind_wan_ip_adress(fdata: KeeneticFullData):
         _LOGGER.debug(f'Not ind_wan_ip_adress - {ex}')
         return None
 
+def convert_rate(rate: float) -> float:
+    """Convert bytes per second to Mbit/s."""
+    return round(rate * 8 / 1000000, 3)
+
+def client_rate(coordinator: KeeneticRouterCoordinator, mac: str, index: int) -> float | None:
+    rate = coordinator.rates.rate(mac)
+    return convert_rate(rate[index]) if rate is not None else None
+
+def top_talkers(coordinator: KeeneticRouterCoordinator) -> dict[str, Any]:
+    """The busiest clients of the last poll, as many as set in the options."""
+    hotspot = coordinator.data.show_ip_hotspot
+    clients = []
+    for mac, rx, tx in coordinator.rates.top(coordinator.entry.options.get(CONF_TOP_TALKERS, DEFAULT_TOP_TALKERS)):
+        device = hotspot.get(mac)
+        clients.append({
+            "mac": mac,
+            "name": (device.name or device.hostname) if device is not None else None,
+            "rx": convert_rate(rx),
+            "tx": convert_rate(tx),
+        })
+    return {"clients": clients}
+
+def rci_latency(coordinator: KeeneticRouterCoordinator, percent: int, phase: str = "total") -> float | None:
+    """Latency percentile of the poll batch in milliseconds."""
+    latency = coordinator.router.request_timings.percentile(TIMING_POLL, phase, percent)
+    return round(latency * 1000, 1) if latency is not None else None
+
+def rci_latency_phases(coordinator: KeeneticRouterCoordinator, percent: int) -> dict[str, Any]:
+    return {phase: rci_latency(coordinator, percent, phase) for phase in RequestTimings.PHASES if phase != "total"}
+
 
 SENSOR_TYPES: tuple[KeeneticRouterSensorEntityDescription, ...] = (
     KeeneticRouterSensorEntityDescription(
         key="cpuload",
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=PERCENTAGE,
+        deadband=5,
+        min_write_interval=60,
     ),
     KeeneticRouterSensorEntityDescription(
         key="memory",
@@ -98,6 +145,8 @@ SENSOR_TYPES: tuple[KeeneticRouterSensorEntityDescription, ...] = (
         key="wan_ip_adress",
         entity_category=EntityCategory.DIAGNOSTIC,
         value=lambda coordinator, key: ind_wan_ip_adress(coordinator.data),
+        sections=("priority_interface", "show_interface"),
+        record=False,
     ),
     KeeneticRouterSensorEntityDescription(
         key="temperature_2_4g",
@@ -106,6 +155,8 @@ SENSOR_TYPES: tuple[KeeneticRouterSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         value=lambda coordinator, key: coordinator.data.show_interface['WifiMaster0']['temperature'],
+        sections=("show_interface",),
+        record=False,
     ),
     KeeneticRouterSensorEntityDescription(
         key="temperature_5g",
@@ -114,12 +165,49 @@ SENSOR_TYPES: tuple[KeeneticRouterSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         value=lambda coordinator, key: coordinator.data.show_interface['WifiMaster1']['temperature'],
+        sections=("show_interface",),
+        record=False,
     ),
     KeeneticRouterSensorEntityDescription(
         key="clients_wifi",
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         value=lambda coordinator, key: len(coordinator.data.show_associations.get("station", [])),
+        sections=("show_associations",),
+        record=False,
+    ),
+    KeeneticRouterSensorEntityDescription(
+        key="rci_latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value=lambda coordinator, key: rci_latency(coordinator, 50),
+        attributes_fn=lambda coordinator, key: rci_latency_phases(coordinator, 50),
+        sections=None,
+    ),
+    KeeneticRouterSensorEntityDescription(
+        key="rci_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value=lambda coordinator, key: rci_latency(coordinator, 95),
+        attributes_fn=lambda coordinator, key: rci_latency_phases(coordinator, 95),
+        sections=None,
+    ),
+    KeeneticRouterSensorEntityDescription(
+        key="rci_latency_p99",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value=lambda coordinator, key: rci_latency(coordinator, 99),
+        attributes_fn=lambda coordinator, key: rci_latency_phases(coordinator, 99),
+        sections=None,
     ),
 )
 
@@ -129,29 +217,76 @@ SENSORS_STAT_INTERFACE: tuple[KeeneticRouterSensorEntityDescription, ...] = (
         state_class=SensorDeviceClass.DATA_SIZE,
         native_unit_of_measurement=UnitOfInformation.MEGABYTES,
         value=lambda coordinator, obj_id: convert_data_size(coordinator.data.stat_interface[obj_id].get('rxbytes')),
+        sections=("stat_interface",),
     ),
     KeeneticRouterSensorEntityDescription(
         key="txbytes",
         state_class=SensorDeviceClass.DATA_SIZE,
         native_unit_of_measurement=UnitOfInformation.MEGABYTES,
         value=lambda coordinator, obj_id: convert_data_size(coordinator.data.stat_interface[obj_id].get('txbytes')),
+        sections=("stat_interface",),
     ),
     KeeneticRouterSensorEntityDescription(
         key="timestamp",
         device_class=SensorDeviceClass.TIMESTAMP,
         value=lambda coordinator, obj_id: convert_uptime(coordinator.data.show_interface[obj_id].get('uptime')),
+        sections=("show_interface",),
     ),
     KeeneticRouterSensorEntityDescription(
         key="rxspeed",
         device_class=SensorDeviceClass.DATA_RATE,
         native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
         value=lambda coordinator, obj_id: convert_data_size(coordinator.data.stat_interface[obj_id].get('rxspeed')),
+        sections=("stat_interface",),
+        deadband=0.1,
+        deadband_percent=10,
+        min_write_interval=60,
     ),
     KeeneticRouterSensorEntityDescription(
         key="txspeed",
         device_class=SensorDeviceClass.DATA_RATE,
         native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
         value=lambda coordinator, obj_id: convert_data_size(coordinator.data.stat_interface[obj_id].get('txspeed')),
+        sections=("stat_interface",),
+        deadband=0.1,
+        deadband_percent=10,
+        min_write_interval=60,
+    ),
+)
+
+SENSORS_HOTSPOT: tuple[KeeneticRouterSensorEntityDescription, ...] = (
+    KeeneticRouterSensorEntityDescription(
+        key="top_talkers",
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        entity_registry_enabled_default=False,
+        value=lambda coordinator, key: sum(convert_rate(rx + tx) for _, rx, tx in coordinator.rates.top(1)),
+        attributes_fn=lambda coordinator, key: top_talkers(coordinator),
+        sections=("show_ip_hotspot",),
+        record=False,
+        changed_fn=lambda coordinator, key: bool(coordinator.rates.changed),
+    ),
+)
+
+SENSORS_CLIENT_RATE: tuple[KeeneticRouterSensorEntityDescription, ...] = (
+    KeeneticRouterSensorEntityDescription(
+        key="client_rxrate",
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        value=lambda coordinator, mac: client_rate(coordinator, mac, 0),
+        sections=("show_ip_hotspot",),
+        changed_fn=lambda coordinator, mac: mac in coordinator.rates.changed,
+    ),
+    KeeneticRouterSensorEntityDescription(
+        key="client_txrate",
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        value=lambda coordinator, mac: client_rate(coordinator, mac, 1),
+        sections=("show_ip_hotspot",),
+        changed_fn=lambda coordinator, mac: mac in coordinator.rates.changed,
     ),
 )
 
@@ -179,9 +314,18 @@ async def async_setup_entry(
                 except Exception as err:
                     _LOGGER.debug(f'async_setup_entry sensor SENSORS_STAT_INTERFACE {description} err - {err}')
 
+    if coordinator.router.hw_type == "router":
+        for description in SENSORS_HOTSPOT:
+            sensors.append(KeeneticRouterSensor(coordinator, description, description.key, description.key))
+        for mac in entry.options.get(CONF_SELECT_CLIENT_RATE, []):
+            device = coordinator.data.show_ip_hotspot.get(mac)
+            name = (device.name or device.hostname or mac) if device is not None else mac
+            for description in SENSORS_CLIENT_RATE:
+                sensors.append(KeeneticClientRateSensor(coordinator, description, mac, name))
+
     async_add_entities(sensors, False)
 
-class KeeneticRouterSensor(CoordinatorEntity[KeeneticRouterCoordinator], SensorEntity):
+class KeeneticRouterSensor(KeeneticEntity, SensorEntity):
     _attr_has_entity_name = True
     entity_description: KeeneticRouterSensorEntityDescription
 
@@ -198,8 +342,53 @@ class KeeneticRouterSensor(CoordinatorEntity[KeeneticRouterCoordinator], SensorE
         self.obj_id = obj_id
         self._attr_unique_id = f"{coordinator.unique_id}_{description.key}_{self.obj_id}"
         self.entity_description = description
+        self._rci_sections = description.sections
+        self._rci_record = obj_id if description.record else None
         self._attr_translation_key = description.key
         self._attr_translation_placeholders = {"name": f"{obj_name}"}
+        self._write_policy = (
+            description.deadband is not None
+            or description.deadband_percent is not None
+            or description.min_write_interval is not None
+        )
+        self._written_value: StateType = None
+        self._written_at: float | None = None
+        self._write_pending = False
+
+    def _records_changed(self) -> bool:
+        if self.entity_description.changed_fn is not None:
+            changed = self.entity_description.changed_fn(self.coordinator, self.obj_id)
+        else:
+            changed = super()._records_changed()
+        if not self._write_policy or not (changed or self._write_pending):
+            return changed
+        self._write_pending = not self._write_allowed()
+        return not self._write_pending
+
+    def _write_allowed(self) -> bool:
+        """Whether the value moved by max(deadband, deadband_percent) since the last write, at most every min_write_interval."""
+        description = self.entity_description
+        if self._written_at is None:
+            return True
+        if description.min_write_interval is not None and time.monotonic() - self._written_at < description.min_write_interval:
+            return False
+        value = self.native_value
+        if not isinstance(value, (int, float)) or not isinstance(self._written_value, (int, float)):
+            return value != self._written_value
+        delta = abs(value - self._written_value)
+        threshold = max(
+            description.deadband or 0,
+            abs(self._written_value) * (description.deadband_percent or 0) / 100,
+        )
+        return delta > 0 and delta >= threshold
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        if self._write_policy:
+            self._written_value = self.native_value
+            self._written_at = time.monotonic()
+            self._write_pending = False
+        super().async_write_ha_state()
 
     @property
     def native_value(self) -> StateType:
@@ -210,6 +399,23 @@ class KeeneticRouterSensor(CoordinatorEntity[KeeneticRouterCoordinator], SensorE
     def extra_state_attributes(self) -> dict[str, str] | None:
         """Return the state attributes of the sensor."""
         if self.entity_description.attributes_fn is not None:
-            return self.entity_description.attributes_fn(self.coordinator.data)
+            return self.entity_description.attributes_fn(self.coordinator, self.obj_id)
         else:
             return None
+
+
+class KeeneticClientRateSensor(KeeneticRouterSensor):
+    """Rate of a hotspot client, on the device of the client."""
+
+    def __init__(
+            self,
+            coordinator: KeeneticRouterCoordinator,
+            description: KeeneticRouterSensorEntityDescription,
+            mac: str,
+            name: str,
+    ) -> None:
+        super().__init__(coordinator, description, mac, name)
+        self._attr_device_info = DeviceInfo(
+            connections={(CONNECTION_NETWORK_MAC, mac)},
+            name=name,
+        )
@@ -15,6 +15,7 @@ from homeassistant.exceptions import ServiceValidationError
 from .const import (
     DOMAIN,
     CROUTER,
+    COORD_FULL,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,6 +23,7 @@ _LOGGER = logging.getLogger(__name__)
 SUPPORTED_SERVICES = [
     "request_api",
     "backup_router",
+    "profile_poll",
 ]
 
 
@@ -30,6 +32,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
     services = {
         "request_api": request_api,
         "backup_router": backup_router,
+        "profile_poll": profile_poll,
     }
 
     async def async_call_keenetic_service(service_call: ServiceCall) -> None:
@@ -67,6 +70,8 @@ def async_unload_services(hass: HomeAssistant) -> None:
 async def request_api(hass: HomeAssistant, entry_id: str, data: Mapping[str, Any]):
     data_json = data.get("data_json", [])
     response = await hass.data[DOMAIN][entry_id][CROUTER].api(data["method"], data["endpoint"], data_json)
+    if data["method"].upper() == "POST":
+        hass.data[DOMAIN][entry_id][COORD_FULL].async_expire_config()
     _LOGGER.debug(f'Services request_api response - {response}')
     return {"response": response}
 
@@ -74,3 +79,12 @@ async def request_api(hass: HomeAssistant, entry_id: str, data: Mapping[str, Any
 async def backup_router(hass: HomeAssistant, entry_id: str, data: Mapping[str, Any]):
     response = await hass.data[DOMAIN][entry_id][CROUTER].async_backup(data["folder"], data["type"])
     return {"response": "success"}
+
+
+async def profile_poll(hass: HomeAssistant, entry_id: str, data: Mapping[str, Any]):
+    profiler = hass.data[DOMAIN][entry_id][COORD_FULL].profiler
+    if "enabled" in data:
+        profiler.enabled = data["enabled"]
+    if data.get("reset", False):
+        profiler.reset()
+    return profiler.as_dict()
@@ -0,0 +1,148 @@
+"""The Keenetic API on-disk storage."""
+
+from __future__ import annotations
+from collections.abc import Awaitable, Callable
+from typing import Any
+from dataclasses import replace
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .keenetic import (
+    DataRcInterface,
+    KeeneticFullData,
+    Router,
+    records_to_rows,
+    rows_to_records,
+    snapshot_full_data,
+)
+from .const import (
+    DOMAIN,
+    RELEASE_NOTES_MAX_AGE,
+    RELEASE_NOTES_SAVE_DELAY,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RELEASE_NOTES = f"{DOMAIN}_release_notes"
+
+# never written to disk, the first live poll fills them in
+RC_INTERFACE_SECRETS = ("password",)
+
+
+class KeeneticSnapshotStore:
+    """Last known data of a router, restored at startup before the first live poll."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
+        self._mac = ""
+        self._full_data: KeeneticFullData | None = None
+        self._rc_interface: dict[str, DataRcInterface] | None = None
+        self._save_pending = False
+
+    async def async_load(self, router: Router) -> tuple[KeeneticFullData | None, dict[str, DataRcInterface] | None]:
+        try:
+            snapshot = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.debug(f"{router.mac} snapshot not loaded - {err}")
+            return None, None
+        if not snapshot or snapshot.get("mac") != router.mac:
+            return None, None
+        self._mac = router.mac
+        if snapshot.get("full_data"):
+            self._full_data = router.restore_full_data(snapshot["full_data"])
+        if snapshot.get("rc_interface") is not None:
+            self._rc_interface = rows_to_records(DataRcInterface, snapshot["rc_interface"])
+        return self._full_data, self._rc_interface
+
+    @callback
+    def async_schedule_save(
+        self,
+        mac: str,
+        full_data: KeeneticFullData | None = None,
+        rc_interface: dict[str, DataRcInterface] | None = None,
+    ) -> None:
+        """Keep the latest data, written at most every SNAPSHOT_SAVE_DELAY and on shutdown."""
+        self._mac = mac
+        if full_data is not None:
+            self._full_data = full_data
+        if rc_interface is not None:
+            self._rc_interface = rc_interface
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        return {
+            "mac": self._mac,
+            "full_data": snapshot_full_data(self._full_data) if self._full_data is not None else {},
+            "rc_interface": records_to_rows({
+                key: replace(record, **dict.fromkeys(RC_INTERFACE_SECRETS)) for key, record in self._rc_interface.items()
+            }) if self._rc_interface is not None else None,
+        }
+
+    async def async_flush(self) -> None:
+        """Write a pending snapshot now, so a reload starts from it."""
+        if self._save_pending:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+
+class ReleaseNotesCache:
+    """Release notes by firmware version and channel, shared by all routers and kept across restarts."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.release_notes")
+        self._notes: dict[str, dict[str, Any]] | None = None
+        self._load_lock = asyncio.Lock()
+        self._pending: dict[str, asyncio.Task[dict[str, Any]]] = {}
+
+    async def _async_load(self) -> None:
+        async with self._load_lock:
+            if self._notes is None:
+                self._notes = (await self._store.async_load() or {}).get("notes", {})
+                self._evict()
+
+    def _evict(self) -> None:
+        expired = time.time() - RELEASE_NOTES_MAX_AGE
+        for key in [key for key, notes in self._notes.items() if notes["fetched"] < expired]:
+            del self._notes[key]
+
+    async def async_get(self, version: str, channel: str, fetch: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+        """Cached notes, or one fetch for all routers asking for the same version at once."""
+        await self._async_load()
+        key = f"{version}|{channel}"
+        notes = self._notes.get(key)
+        if notes is not None and notes["fetched"] >= time.time() - RELEASE_NOTES_MAX_AGE:
+            return notes
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = self._hass.async_create_task(self._async_fetch(key, fetch), f"{DATA_RELEASE_NOTES}-{key}")
+        return await asyncio.shield(task)
+
+    async def _async_fetch(self, key: str, fetch: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+        try:
+            notes = {**await fetch(), "fetched": time.time()}
+        finally:
+            self._pending.pop(key, None)
+        self._notes[key] = notes
+        self._evict()
+        self._store.async_delay_save(lambda: {"notes": self._notes}, RELEASE_NOTES_SAVE_DELAY)
+        return notes
+
+
+@callback
+def async_get_release_notes_cache(hass: HomeAssistant) -> ReleaseNotesCache:
+    if DATA_RELEASE_NOTES not in hass.data:
+        hass.data[DATA_RELEASE_NOTES] = ReleaseNotesCache(hass)
+    return hass.data[DATA_RELEASE_NOTES]
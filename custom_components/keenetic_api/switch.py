@@ -11,7 +11,6 @@ from homeassistant.core import HomeAssistant
 from homeassistant.const import EntityCategory
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.typing import StateType
 
 from .const import (
@@ -23,6 +22,7 @@ from .const import (
 from .coordinator import (
     KeeneticRouterCoordinator,
 )
+from .entity import KeeneticEntity
 from .keenetic import DataRcInterface
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,6 +35,7 @@ class KeeneticSwitchEntityDescription(SwitchEntityDescription):
     on_func: Callable[[KeeneticRouterCoordinator], None]
     off_func: Callable[[KeeneticRouterCoordinator], None]
     placeholder: str | None = None
+    sections: tuple[str, ...] = ()
 
 SWITCH_TYPES: tuple[KeeneticSwitchEntityDescription, ...] = (
     KeeneticSwitchEntityDescription(
@@ -42,6 +43,7 @@ SWITCH_TYPES: tuple[KeeneticSwitchEntityDescription, ...] = (
         is_on_func=lambda coordinator, label_sw: coordinator.data.show_rc_ip_http['security-level'].get('public', False),
         on_func=lambda coordinator, label_sw: coordinator.router.turn_on_off_web_configurator_access(True),
         off_func=lambda coordinator, label_sw: coordinator.router.turn_on_off_web_configurator_access(False),
+        sections=("show_rc_ip_http",),
     ),
     KeeneticSwitchEntityDescription(
         key="power_usb",
@@ -49,6 +51,7 @@ SWITCH_TYPES: tuple[KeeneticSwitchEntityDescription, ...] = (
         on_func=lambda coordinator, label_sw: coordinator.router.turn_on_off_usb(True, label_sw),
         off_func=lambda coordinator, label_sw: coordinator.router.turn_on_off_usb(False, label_sw),
         placeholder="number",
+        sections=("show_rc_system_usb",),
     ),
 )
 
@@ -102,7 +105,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     async_add_entities(switchs)
 
 
-class KeeneticSwitchEntity(CoordinatorEntity[KeeneticRouterCoordinator], SwitchEntity):
+class KeeneticSwitchEntity(KeeneticEntity, SwitchEntity):
 
     entity_description: KeeneticSwitchEntityDescription
     _attr_has_entity_name = True
@@ -115,6 +118,7 @@ class KeeneticSwitchEntity(CoordinatorEntity[KeeneticRouterCoordinator], SwitchE
     ) -> None:
         super().__init__(coordinator)
         self.entity_description = entity_description
+        self._rci_sections = entity_description.sections
         self._label_sw = label_sw
         self._attr_translation_key = self.entity_description.key
         self._attr_unique_id = f"{coordinator.unique_id}_{self._attr_translation_key}_{self._label_sw}"
@@ -130,17 +134,18 @@ class KeeneticSwitchEntity(CoordinatorEntity[KeeneticRouterCoordinator], SwitchE
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         await self.entity_description.on_func(self.coordinator, self._label_sw)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_config_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         await self.entity_description.off_func(self.coordinator, self._label_sw)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_config_refresh()
 
 
-class KeeneticInterfaceSwitchEntity(CoordinatorEntity[KeeneticRouterCoordinator], SwitchEntity):
+class KeeneticInterfaceSwitchEntity(KeeneticEntity, SwitchEntity):
 
     _attr_translation_key="interface"
     _attr_has_entity_name = True
+    _rci_sections = ("show_interface",)
 
     def __init__(
         self,
@@ -151,6 +156,7 @@ class KeeneticInterfaceSwitchEntity(CoordinatorEntity[KeeneticRouterCoordinator]
         """Initialize the Keenetic Interface switch."""
         super().__init__(coordinator)
         self._id_interface = data_interface['id']
+        self._rci_record = self._id_interface
         self._name_interface = name_interface
         self._attr_unique_id = f"{coordinator.unique_id}_{self._attr_translation_key}_{self._id_interface}"
         self._attr_device_info = coordinator.device_info
@@ -164,12 +170,12 @@ class KeeneticInterfaceSwitchEntity(CoordinatorEntity[KeeneticRouterCoordinator]
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on."""
         await self.coordinator.router.turn_on_off_interface(self._id_interface, 'up')
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_config_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off."""
         await self.coordinator.router.turn_on_off_interface(self._id_interface, 'down')
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_config_refresh()
 
     @property
     def extra_state_attributes(self) -> dict[str, StateType]:
@@ -179,10 +185,11 @@ class KeeneticInterfaceSwitchEntity(CoordinatorEntity[KeeneticRouterCoordinator]
         }
 
 
-class KeeneticPortForwardingSwitchEntity(CoordinatorEntity[KeeneticRouterCoordinator], SwitchEntity):
+class KeeneticPortForwardingSwitchEntity(KeeneticEntity, SwitchEntity):
 
     _attr_translation_key="port_forwarding"
     _attr_has_entity_name = True
+    _rci_sections = ("show_rc_ip_static",)
 
     def __init__(
         self,
@@ -193,6 +200,7 @@ class KeeneticPortForwardingSwitchEntity(CoordinatorEntity[KeeneticRouterCoordin
         super().__init__(coordinator)
         self._pfrw = port_frw
         self._pfrw_index = port_frw.index
+        self._rci_record = self._pfrw_index
         self._pfrw_name = port_frw.name
         self._attr_unique_id = f"{coordinator.unique_id}_{self._attr_translation_key}_{self._pfrw_index}"
         self._attr_device_info = coordinator.device_info
@@ -206,12 +214,12 @@ class KeeneticPortForwardingSwitchEntity(CoordinatorEntity[KeeneticRouterCoordin
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on."""
         await self.coordinator.router.turn_on_off_port_forwarding(self._pfrw_index, True)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_config_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off."""
         await self.coordinator.router.turn_on_off_port_forwarding(self._pfrw_index, False)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_config_refresh()
 
     @property
     def extra_state_attributes(self) -> dict[str, StateType]:
@@ -64,6 +64,11 @@ class KeeneticUpdateEntity(CoordinatorEntity[KeeneticRouterFirmwareCoordinator],
         if len(self._backup_type_file) > 0:
             self._attr_supported_features |= UpdateEntityFeature.BACKUP
 
+    @property
+    def available(self) -> bool:
+        """Available once the background firmware check has data."""
+        return super().available and bool(self.coordinator.data)
+
     @property
     def title(self) -> str | None:
         """Title channel."""
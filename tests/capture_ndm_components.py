@@ -0,0 +1,65 @@
+"""Capture /ndmComponents.js of a router as a parser fixture, identifying values redacted.
+
+    python tests/capture_ndm_components.py http://192.168.1.1 80 admin PASSWORD giga
+
+writes tests/fixtures/ndmComponents_giga.js, picked up by test_js_parser.py.
+"""
+
+from __future__ import annotations
+import asyncio
+import importlib.util
+import re
+import sys
+from pathlib import Path
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+_SECRET_NAMES = r"[\w-]*(?:serial|servicetag|sn|cid|uid|mac|password|passwd|psk|key|token|license)[\w-]*"
+_SECRET_VALUES = re.compile(
+    rf"""(?P<head>(?:\b{_SECRET_NAMES}\s*=\s*|"{_SECRET_NAMES}"\s*:\s*))(?P<quote>["'])(?:[^"'\\]|\\.)*(?P=quote)""",
+    re.IGNORECASE,
+)
+_MAC = re.compile(r"\b[0-9a-fA-F]{2}(?:[:-][0-9a-fA-F]{2}){5}\b")
+_IP = re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")
+
+
+def redact(text: str) -> str:
+    text = _SECRET_VALUES.sub(lambda match: f'{match["head"]}{match["quote"]}REDACTED{match["quote"]}', text)
+    text = _MAC.sub("00:00:00:00:00:00", text)
+    return _IP.sub("192.168.1.1", text)
+
+
+def load_keenetic():
+    """Import keenetic.py on its own, without Home Assistant."""
+    spec = importlib.util.spec_from_file_location("keenetic", ROOT / "custom_components" / "keenetic_api" / "keenetic.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+async def capture(host: str, port: int, username: str, password: str) -> str:
+    keenetic = load_keenetic()
+    async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True)) as session:
+        router = keenetic.Router(session=session, host=host, port=port, username=username, password=password)
+        await router.auth()
+        async with session.get(f"{router.url_router}/ndmComponents.js") as response:
+            response.raise_for_status()
+            return await response.text()
+
+
+def main() -> None:
+    if len(sys.argv) != 6:
+        sys.exit(__doc__)
+    host, port, username, password, model = sys.argv[1:]
+    text = redact(asyncio.run(capture(host, int(port), username, password)))
+    path = FIXTURES / f"ndmComponents_{model}.js"
+    path.write_text(text)
+    print(f"{path} - check it for anything else identifying before committing")
+
+
+if __name__ == "__main__":
+    main()
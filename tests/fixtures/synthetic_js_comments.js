@@ -0,0 +1,10 @@
+// generated by ndm
+/* components; version = 4.1.7 */
+var ndmVersion = "4.1.7"; // stable
+var ndmTitle = 'Keenetic; "Giga"';
+var ndmUrl = "http://192.168.1.1/?page=components;lang=ru";
+var ndmComponents = {
+	"base": {"note": "a } b; c = d"}, // inner comment
+	"wifi": {"bands": [2.4, 5]}
+};
+var ndmEscaped = "say \"hi\"";
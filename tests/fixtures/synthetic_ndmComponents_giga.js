@@ -0,0 +1,14 @@
+var ndmVersion = "4.1.7";
+var ndmTitle = "4.1.7";
+var ndmHwId = "KN-1011";
+var ndmDevice = "Giga";
+var ndmSandbox = "stable";
+var ndmArch = "mips";
+var ndmComponents = {
+	"base": {"version": "4.1.7", "group": "base"},
+	"ipv6": {"version": "4.1.7", "group": "network", "depend": ["base"]},
+	"wifi": {"version": "4.1.7", "group": "network", "bands": [2.4, 5]},
+	"usb": {"version": "4.1.7", "group": "storage", "ports": [1, 2]}
+};
+var ndmLanguages = ["ru", "en", "uk", "tr"];
+var ndmReleaseNotes = "https://help.keenetic.com/hc/ru/articles/release-notes";
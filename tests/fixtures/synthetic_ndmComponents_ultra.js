@@ -0,0 +1,14 @@
+var ndmVersion = "4.2.0.0.C.2";
+var ndmTitle = "4.2 Beta 2";
+var ndmHwId = "KN-1811";
+var ndmDevice = "Ultra";
+var ndmSandbox = "preview";
+var ndmComponents = {
+	"base": {"version": "4.2.0.0.C.2", "group": "base"},
+	"vpn": {
+		"version": "4.2.0.0.C.2",
+		"group": "vpn",
+		"items": {"wireguard": {"installed": true}, "openvpn": {"installed": false}}
+	}
+};
+var ndmInstalled = 2;
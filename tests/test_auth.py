@@ -0,0 +1,35 @@
+"""Tests of the router session against the challenge login of the fake router."""
+
+import asyncio
+
+from aiohttp import ClientSession, CookieJar
+import pytest
+
+from benchmarks.fake_router import FakeRouter, start_fake_router
+from custom_components.keenetic_api.keenetic import Router
+
+
+async def expired_session_calls(calls: int) -> tuple[list, dict[str, int], FakeRouter]:
+    fake = FakeRouter(3, 1, latency=0.01)
+    runner, port = await start_fake_router(fake)
+    try:
+        async with ClientSession(cookie_jar=CookieJar(unsafe=True)) as session:
+            router = Router(session=session, host="http://127.0.0.1", port=port, username="admin", password="admin")
+            await router.api("get", "/rci/show/system")
+            fake.sessions.clear()
+            fake.requests.clear()
+            results = await asyncio.gather(
+                *(router.api("get", "/rci/show/system") for _ in range(calls)), return_exceptions=True
+            )
+            return results, router.auth_stats, fake
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.parametrize("calls", [2, 6, 10])
+def test_concurrent_requests_authenticate_once(calls: int) -> None:
+    # more calls than MAX_IN_FLIGHT queue on the limiter, so 401s keep arriving during the login
+    results, auth_stats, fake = asyncio.run(expired_session_calls(calls))
+    assert all(isinstance(result, dict) for result in results), results
+    assert auth_stats["forced"] == calls
+    assert fake.requests["/auth"] <= 2
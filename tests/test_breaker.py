@@ -0,0 +1,52 @@
+"""Tests of the circuit breaker guarding the requests to a router."""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from custom_components.keenetic_api.keenetic import CircuitBreaker, Router
+
+
+class FailingSession:
+    """Session whose every request fails with the given error."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+        self.requests = 0
+
+    def request(self, **kwargs):
+        self.requests += 1
+        raise self.error
+
+
+def open_router(error: BaseException) -> tuple[Router, FailingSession]:
+    session = FailingSession(error)
+    router = Router(session)
+    router._breaker.state = CircuitBreaker.OPEN
+    return router, session
+
+
+@pytest.mark.parametrize("error", [aiohttp.ClientPayloadError("truncated"), asyncio.CancelledError()])
+def test_failed_probe_reopens_the_breaker(error: BaseException) -> None:
+    router, session = open_router(error)
+
+    async def call() -> None:
+        for _ in range(3):
+            with pytest.raises(BaseException):
+                await router.api("get", "/rci/show/system")
+
+    asyncio.run(call())
+    assert router._breaker.state == CircuitBreaker.OPEN
+    assert router._breaker.retry_in > 0
+    # only the first call probed, the others waited for the backoff
+    assert session.requests == 1
+
+
+def test_client_error_counts_as_failure() -> None:
+    router, _ = open_router(aiohttp.ClientPayloadError("truncated"))
+    router._breaker.state = CircuitBreaker.CLOSED
+    for _ in range(3):
+        with pytest.raises(aiohttp.ClientError):
+            asyncio.run(router.reguest_api("get", "/auth"))
+    assert router._breaker.state == CircuitBreaker.OPEN
@@ -0,0 +1,29 @@
+"""Tests for the fleet poll phases."""
+
+import asyncio
+from unittest.mock import patch
+
+from custom_components.keenetic_api import fleet as fleet_module
+from custom_components.keenetic_api.fleet import KeeneticFleet
+
+
+def _phases(fleet: KeeneticFleet, interval: float) -> dict[str, float]:
+    with patch.object(fleet_module.time, "monotonic", return_value=fleet._epoch):
+        return {entry: fleet.poll_delay(entry, interval) for entry in fleet._slots}
+
+
+def test_phases_spread_evenly() -> None:
+    fleet = KeeneticFleet()
+    for entry in ("a", "b", "c"):
+        fleet.add_entry(entry)
+    assert _phases(fleet, 30) == {"a": 0, "b": 10, "c": 20}
+
+
+def test_phases_compact_after_removal() -> None:
+    fleet = KeeneticFleet()
+    for entry in ("a", "b", "c"):
+        fleet.add_entry(entry)
+    assert not asyncio.run(fleet.async_remove_entry("a"))
+    assert _phases(fleet, 30) == {"b": 0, "c": 15}
+    fleet.add_entry("d")
+    assert _phases(fleet, 30) == {"b": 0, "c": 10, "d": 20}
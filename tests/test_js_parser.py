@@ -0,0 +1,63 @@
+"""Tests of the JS-typed response parser against ndmComponents.js payloads."""
+
+from pathlib import Path
+
+import pytest
+
+from custom_components.keenetic_api.keenetic import parse_js_assignments, parse_js_statements
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def legacy_data_parser(data: str) -> dict[str, str]:
+    """Router.data_parser before parse_js_assignments."""
+    new_data = {}
+    data = data.replace('\n\t', '').replace('\n', '')
+    data = data.split(';')
+    for row in data:
+        if row != '':
+            row = row.split('=')
+            nu = row[0].rstrip()
+            te = row[1].lstrip()
+            if '{' not in te:
+                te = te.replace('"', '')
+            new_data[nu] = te
+    return new_data
+
+
+# ndmComponents_<model>.js are captured by capture_ndm_components.py, synthetic_* follow their layout
+NDM_COMPONENTS = sorted(path.name for path in FIXTURES.glob("*ndmComponents_*.js"))
+
+
+@pytest.mark.parametrize("fixture", NDM_COMPONENTS)
+def test_matches_legacy_parser(fixture: str) -> None:
+    text = (FIXTURES / fixture).read_text()
+    assert parse_js_assignments(text) == legacy_data_parser(text)
+    assert parse_js_statements(text) == legacy_data_parser(text)
+
+
+def test_strings_comments_and_nested_literals() -> None:
+    text = (FIXTURES / "synthetic_js_comments.js").read_text()
+    assert parse_js_assignments(text) == {
+        "var ndmVersion": "4.1.7",
+        "var ndmTitle": 'Keenetic; "Giga"',
+        "var ndmUrl": "http://192.168.1.1/?page=components;lang=ru",
+        "var ndmComponents": '{"base": {"note": "a } b; c = d"}, "wifi": {"bands": [2.4, 5]}}',
+        "var ndmEscaped": 'say "hi"',
+    }
+
+
+def test_deeply_nested_literal() -> None:
+    literal = "{" * 10 + '"a;b"' + "}" * 10
+    assert parse_js_assignments(f'var x = {literal};\nvar y = "z";') == {"var x": literal, "var y": "z"}
+
+
+def test_equals_in_value() -> None:
+    assert parse_js_assignments('var a = b == c;\nvar d = {"e": "f=g"};') == {
+        "var a": "b == c",
+        "var d": '{"e": "f=g"}',
+    }
+
+
+def test_statement_without_assignment() -> None:
+    assert parse_js_assignments('init();\nvar a = "b";') == {"var a": "b"}
@@ -0,0 +1,90 @@
+"""Tests of the presence engine, polls against router log events."""
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.keenetic_api.const import EVENT_CLIENT_JOIN, EVENT_CLIENT_LEAVE, EVENT_CLIENT_ROAM
+from custom_components.keenetic_api.keenetic import HotspotTable, LogPresence
+from custom_components.keenetic_api.presence import PresenceEngine
+
+MAC = "02:00:00:00:00:01"
+
+
+def host(active: bool = True, interface: str = "Bridge0", rxbytes: int = 0) -> dict[str, Any]:
+    return {"mac": MAC, "name": "Phone", "ip": "192.168.1.2", "active": active, "interface": {"id": interface}, "rxbytes": rxbytes}
+
+
+@pytest.fixture
+def events() -> list[tuple[str, dict[str, Any]]]:
+    return []
+
+
+@pytest.fixture
+def engine(events: list[tuple[str, dict[str, Any]]]) -> PresenceEngine:
+    hass = SimpleNamespace(bus=SimpleNamespace(async_fire=lambda event_type, data: events.append((event_type, data))))
+    return PresenceEngine(hass, "50:ff:20:00:00:01")
+
+
+def poll(engine: PresenceEngine, table: HotspotTable, *hosts: dict[str, Any]) -> None:
+    engine.async_update(table.update_hosts(list(hosts)))
+
+
+def test_log_leave_overruled_by_poll(engine: PresenceEngine, events: list) -> None:
+    table = HotspotTable()
+    poll(engine, table)
+    poll(engine, table, host())
+    assert [event_type for event_type, _ in events] == [EVENT_CLIENT_JOIN]
+
+    # FT roam: the log reports a deauthentication, the client stays connected
+    updates = []
+    engine.async_subscribe(MAC, lambda: updates.append(engine.is_connected(MAC)))
+    assert engine.async_apply_log([LogPresence(1, MAC, False)])
+    assert not engine.is_connected(MAC)
+    poll(engine, table, host())
+    assert not table.changed
+    assert engine.is_connected(MAC)
+    assert updates == [False, True]
+    assert [event_type for event_type, _ in events] == [EVENT_CLIENT_JOIN]
+
+
+def test_log_leave_confirmed_by_poll(engine: PresenceEngine, events: list) -> None:
+    table = HotspotTable()
+    poll(engine, table, host())
+    assert engine.async_apply_log([LogPresence(1, MAC, False)])
+    assert not engine.async_apply_log([LogPresence(2, MAC, False)])
+    assert events == []
+    poll(engine, table, host(active=False))
+    assert [(event_type, data["source"]) for event_type, data in events] == [(EVENT_CLIENT_LEAVE, "log")]
+    assert not engine.is_connected(MAC)
+
+
+def test_log_join_of_new_client(engine: PresenceEngine, events: list) -> None:
+    table = HotspotTable()
+    poll(engine, table)
+    new_clients = []
+    engine.async_subscribe_new_clients(new_clients.append)
+    assert engine.async_apply_log([LogPresence(1, MAC, True, "192.168.1.2")])
+    assert engine.is_connected(MAC)
+    assert events == []
+    poll(engine, table, host())
+    assert [(event_type, data["source"]) for event_type, data in events] == [(EVENT_CLIENT_JOIN, "log")]
+    assert new_clients == [{MAC}]
+
+
+def test_roam(engine: PresenceEngine, events: list) -> None:
+    table = HotspotTable()
+    poll(engine, table, host())
+    # the client leaves one access point and associates with the other
+    engine.async_apply_log([LogPresence(1, MAC, False), LogPresence(2, MAC, True)])
+    assert engine.is_connected(MAC)
+    poll(engine, table, host(interface="Bridge1"))
+    assert [(event_type, data.get("previous_interface")) for event_type, data in events] == [(EVENT_CLIENT_ROAM, "Bridge0")]
+    poll(engine, table, host(interface="Bridge1", rxbytes=100))
+    assert len(events) == 1
+
+
+def test_log_before_baseline(engine: PresenceEngine, events: list) -> None:
+    assert not engine.async_apply_log([LogPresence(1, MAC, True)])
+    assert not engine.is_connected(MAC)
@@ -0,0 +1,79 @@
+"""Tests of the state write policies of router sensors."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.keenetic_api import sensor as sensor_module
+from custom_components.keenetic_api.sensor import KeeneticRouterSensor, KeeneticRouterSensorEntityDescription
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    clock = Clock()
+    with patch.object(sensor_module.time, "monotonic", clock):
+        yield clock
+
+
+def make_sensor(**policy: float) -> tuple[KeeneticRouterSensor, SimpleNamespace]:
+    coordinator = SimpleNamespace(unique_id="router", device_info=None, value=0.0)
+    description = KeeneticRouterSensorEntityDescription(key="load", value=lambda coordinator, key: coordinator.value, **policy)
+    sensor = KeeneticRouterSensor(coordinator, description, "load", "load")
+    sensor._written_value = coordinator.value
+    sensor._written_at = sensor_module.time.monotonic()
+    return sensor, coordinator
+
+
+def allowed(sensor: KeeneticRouterSensor, coordinator: SimpleNamespace, value: float) -> bool:
+    coordinator.value = value
+    return sensor._write_allowed()
+
+
+def test_absolute_deadband(clock: Clock) -> None:
+    sensor, coordinator = make_sensor(deadband=5)
+    assert not allowed(sensor, coordinator, 4)
+    assert allowed(sensor, coordinator, 5)
+    assert allowed(sensor, coordinator, -6)
+
+
+def test_percent_deadband(clock: Clock) -> None:
+    sensor, coordinator = make_sensor(deadband_percent=10)
+    sensor._written_value = 50.0
+    assert not allowed(sensor, coordinator, 54)
+    assert allowed(sensor, coordinator, 55)
+    assert allowed(sensor, coordinator, 44)
+
+
+def test_both_deadbands_must_be_exceeded(clock: Clock) -> None:
+    sensor, coordinator = make_sensor(deadband=0.1, deadband_percent=10)
+    # near zero the absolute band decides
+    sensor._written_value = 0.2
+    assert not allowed(sensor, coordinator, 0.25)
+    assert allowed(sensor, coordinator, 0.35)
+    # at high rates the percent band decides
+    sensor._written_value = 100.0
+    assert not allowed(sensor, coordinator, 105)
+    assert allowed(sensor, coordinator, 110)
+
+
+def test_min_write_interval(clock: Clock) -> None:
+    sensor, coordinator = make_sensor(min_write_interval=60)
+    assert not allowed(sensor, coordinator, 50)
+    clock.now += 60
+    assert allowed(sensor, coordinator, 50)
+    assert not allowed(sensor, coordinator, 0)
+
+
+def test_first_write_always_allowed(clock: Clock) -> None:
+    sensor, coordinator = make_sensor(deadband=5, min_write_interval=60)
+    sensor._written_at = None
+    assert allowed(sensor, coordinator, 1)
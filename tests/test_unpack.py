@@ -0,0 +1,54 @@
+"""Tests of splitting a batch response back into KeeneticFullData."""
+
+import json
+
+from custom_components.keenetic_api.keenetic import Router, iter_rci_batch, rci_array_paths
+
+HOST = {"mac": "02:00:00:00:00:01", "name": "Phone", "ip": "192.168.1.2", "active": True, "interface": {"id": "Bridge0"}}
+
+
+def test_hotspot_not_polled_yet() -> None:
+    router = Router(None)
+    plan = [("show_system", None, {})]
+    full_data = router.unpack_response(plan, [{"show": {"system": {"cpuload": 5}}}])
+    assert full_data.show_ip_hotspot is None
+
+
+def test_hotspot_keeps_the_persistent_table() -> None:
+    router = Router(None)
+    polled = router.unpack_response([("show_ip_hotspot", None, {})], [{"show": {"ip": {"hotspot": {"host": [HOST]}}}}])
+    full_data = router.unpack_response([("show_system", None, {})], [{"show": {"system": {}}}])
+    assert full_data.show_ip_hotspot is polled.show_ip_hotspot
+    assert list(full_data.show_ip_hotspot) == [HOST["mac"]]
+
+
+BATCH = [
+    {"show": {"system": {"cpuload": 5}}},
+    {"show": {"ip": {"hotspot": {"host": [HOST, {**HOST, "mac": "02:00:00:00:00:02", "active": False}], "after": {"x": [1]}}}}},
+    {"show": {"rc": {"ip": {"static": [{"index": "1", "port": 80, "to-host": "192.168.1.3", "comment": "web"}]}}}},
+    {"show": {"rc": {"ip": {"hotspot": {"status": [{"status": "error", "message": "no hosts"}]}}}}},
+]
+PLAN = [("show_system", None, {}), ("show_ip_hotspot", None, {}), ("show_rc_ip_static", None, {}), ("show_ip_hotspot_policy", None, {})]
+
+
+def test_records_decoded_one_at_a_time() -> None:
+    text = json.dumps(BATCH, indent=1)
+    elements = iter_rci_batch(text, rci_array_paths(PLAN))
+    next(elements)
+    hosts = next(elements)["show"]["ip"]["hotspot"]["host"]
+    assert not isinstance(hosts, list)
+    assert next(hosts) == HOST
+    # the rest of the array and the keys after it are skipped
+    assert list(next(elements)["show"]["rc"]["ip"]["static"]) == BATCH[2]["show"]["rc"]["ip"]["static"]
+    assert next(elements) == BATCH[3]
+    assert next(elements, None) is None
+
+
+def test_same_tables_as_the_whole_decode() -> None:
+    text = json.dumps(BATCH)
+    whole = Router(None).unpack_response(PLAN, json.loads(text))
+    lazy = Router(None).unpack_response(PLAN, iter_rci_batch(text, rci_array_paths(PLAN)))
+    assert lazy.show_ip_hotspot == whole.show_ip_hotspot
+    assert lazy.show_rc_ip_static == whole.show_rc_ip_static
+    assert lazy.show_ip_hotspot_policy == whole.show_ip_hotspot_policy == {}
+    assert lazy.show_system == whole.show_system